@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+APOD Backfill
+Downloads NASA APOD archive images into images/ concurrently and records them in a manifest
+(date, title, path, size, SHA-256), so the rest of the pipeline can use the images without
+re-scanning the folder. A backfill that is interrupted can simply be started again: images
+that were partly downloaded are resumed where they stopped.
+
+Usage:
+  python apod_backfill.py --start 2024-01-01 [--end 2024-12-31] [--concurrency 8] [--per-host 4]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import aiohttp
+from config import Config
+from nasa_apod import APOD_DATE_FORMAT, DOWNLOAD_CHUNK_SIZE, NASAAPOD, DownloadState, image_filename
+from utils import file_digest, file_sha256
+
+# Days of archive metadata requested from the APOD API at a time
+RANGE_REQUEST_DAYS = 90
+
+
+def read_manifest(manifest_path: str = None) -> Dict[str, Dict]:
+    """Read the backfill manifest (JSON lines), keyed by APOD date"""
+    manifest_path = manifest_path or Config.APOD_MANIFEST_PATH
+    manifest = {}
+    if not os.path.exists(manifest_path):
+        return manifest
+
+    with open(manifest_path, 'r', encoding='utf-8') as manifest_file:
+        for line in manifest_file:
+            if line.strip():
+                entry = json.loads(line)
+                manifest[entry["date"]] = entry
+    return manifest
+
+
+def _append_manifest(manifest_path: str, entry: Dict):
+    with open(manifest_path, 'a', encoding='utf-8') as manifest_file:
+        manifest_file.write(json.dumps(entry) + "\n")
+
+
+def fetch_archive_entries(nasa: NASAAPOD, start_date: str, end_date: str) -> List[Dict]:
+    """Get the APOD entries of a date range, a few months per API request"""
+    entries = []
+    current = datetime.strptime(start_date, APOD_DATE_FORMAT)
+    end = datetime.strptime(end_date, APOD_DATE_FORMAT)
+    while current <= end:
+        chunk_end = min(current + timedelta(days=RANGE_REQUEST_DAYS - 1), end)
+        entries.extend(nasa.get_apod_range(current.strftime(APOD_DATE_FORMAT), chunk_end.strftime(APOD_DATE_FORMAT)))
+        current = chunk_end + timedelta(days=1)
+    return entries
+
+
+def _image_url(entry: Dict) -> Optional[str]:
+    if entry.get('media_type') != 'image':
+        return None
+    return entry.get('hdurl') or entry.get('url')
+
+
+async def _download(session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, entry: Dict,
+                    images_dir: str, download_state: DownloadState) -> Dict:
+    """Stream one archive image to disk, hashing it on the way; failures are returned with an "error"
+
+    Uses the same .part files and download state as NASAAPOD.download_image, so an interrupted
+    download is resumed with a Range request on the next run.
+    """
+    image_url = _image_url(entry)
+    filepath = os.path.join(images_dir, image_filename(image_url))
+    temp_path = f"{filepath}.part"
+
+    try:
+        async with semaphore:
+            # State queries and file writes run in threads, so they don't hold up the other downloads
+            headers = await asyncio.to_thread(download_state.request_headers, filepath, image_url)
+            async with session.get(image_url, headers=headers) as response:
+                if response.status != 304:
+                    response.raise_for_status()
+                mode, total_size = await asyncio.to_thread(
+                    download_state.plan, filepath, image_url, response.status,
+                    response.headers.get('ETag'), response.content_length
+                )
+                if mode is None:
+                    size = os.path.getsize(filepath)
+                    sha256 = await asyncio.to_thread(file_sha256, filepath)
+                else:
+                    # A resumed download is hashed from the bytes already on disk
+                    digest = await asyncio.to_thread(file_digest, temp_path) if mode == 'ab' else hashlib.sha256()
+                    image_file = await asyncio.to_thread(open, temp_path, mode)
+                    try:
+                        async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                            await asyncio.to_thread(_write_chunk, image_file, digest, chunk)
+                    finally:
+                        await asyncio.to_thread(image_file.close)
+                    await asyncio.to_thread(download_state.finish, filepath, total_size)
+                    size = os.path.getsize(filepath)
+                    sha256 = digest.hexdigest()
+    except Exception as e:
+        await asyncio.to_thread(download_state.discard_unresumable, filepath)
+        return {"date": entry["date"], "url": image_url, "error": str(e)}
+
+    return {
+        "date": entry["date"],
+        "title": entry.get("title"),
+        "path": filepath,
+        "size": size,
+        "sha256": sha256,
+        "url": image_url
+    }
+
+
+def _write_chunk(image_file, digest, chunk: bytes):
+    image_file.write(chunk)
+    digest.update(chunk)
+
+
+async def backfill_images(entries: List[Dict], images_dir: str = 'images', concurrency: int = None,
+                          per_host: int = None, manifest_path: str = None) -> Dict[str, float]:
+    """Download the images of APOD entries that aren't in the manifest yet
+
+    At most `concurrency` downloads run at once, with at most `per_host` connections to any
+    one host. Returns backfill statistics: downloaded, skipped, failed, bytes and elapsed seconds.
+    """
+    concurrency = concurrency or Config.APOD_BACKFILL_CONCURRENCY
+    per_host = per_host or Config.APOD_BACKFILL_PER_HOST
+    manifest_path = manifest_path or Config.APOD_MANIFEST_PATH
+    manifest_dir = os.path.dirname(manifest_path)
+    if manifest_dir:
+        os.makedirs(manifest_dir, exist_ok=True)
+    os.makedirs(images_dir, exist_ok=True)
+
+    manifest = read_manifest(manifest_path)
+    stats = {"downloaded": 0, "skipped": 0, "failed": 0, "bytes": 0}
+    started_at = time.monotonic()
+
+    pending = []
+    pending_paths = set()
+    for entry in entries:
+        image_url = _image_url(entry)
+        if not image_url:
+            continue
+
+        known = manifest.get(entry["date"])
+        if known and os.path.exists(known["path"]) and os.path.getsize(known["path"]) == known["size"]:
+            stats["skipped"] += 1
+            continue
+
+        # Images fetched earlier by the daily run only need a manifest entry
+        filepath = os.path.join(images_dir, image_filename(image_url))
+        if filepath in pending_paths:
+            continue
+        if os.path.exists(filepath):
+            _append_manifest(manifest_path, {
+                "date": entry["date"],
+                "title": entry.get("title"),
+                "path": filepath,
+                "size": os.path.getsize(filepath),
+                "sha256": file_sha256(filepath),
+                "url": image_url
+            })
+            stats["skipped"] += 1
+            continue
+
+        pending.append(entry)
+        pending_paths.add(filepath)
+
+    print(f"🔭 {len(pending)} images to download, {stats['skipped']} already in {images_dir}")
+    if not pending:
+        stats["elapsed"] = time.monotonic() - started_at
+        return stats
+
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=per_host)
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=60)
+    download_state = DownloadState()
+    try:
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            downloads = [_download(session, semaphore, entry, images_dir, download_state) for entry in pending]
+            for done, download in enumerate(asyncio.as_completed(downloads), start=1):
+                result = await download
+                if "error" in result:
+                    stats["failed"] += 1
+                    print(f"[{done}/{len(pending)}] ❌ {result['date']}: {result['error']}")
+                    continue
+
+                _append_manifest(manifest_path, result)
+                stats["downloaded"] += 1
+                stats["bytes"] += result["size"]
+                elapsed = time.monotonic() - started_at
+                print(f"[{done}/{len(pending)}] ✅ {result['date']} {result['title']} "
+                      f"({result['size'] / 1024 / 1024:.1f} MB, {stats['bytes'] / 1024 / 1024 / elapsed:.1f} MB/s)")
+    finally:
+        download_state.close()
+
+    stats["elapsed"] = time.monotonic() - started_at
+    return stats
+
+
+def main():
+    today = datetime.now()
+    parser = argparse.ArgumentParser(description="Download NASA APOD archive images into the image pool")
+    parser.add_argument("--start", default=(today - timedelta(days=30)).strftime(APOD_DATE_FORMAT),
+                        help="First date, YYYY-MM-DD (default: 30 days ago)")
+    parser.add_argument("--end", default=today.strftime(APOD_DATE_FORMAT), help="Last date, YYYY-MM-DD (default: today)")
+    parser.add_argument("--images-dir", default="images")
+    parser.add_argument("--concurrency", type=int, help="Downloads at once (default: APOD_BACKFILL_CONCURRENCY)")
+    parser.add_argument("--per-host", type=int, help="Connections per host (default: APOD_BACKFILL_PER_HOST)")
+    args = parser.parse_args()
+
+    nasa = NASAAPOD(Config.NASA_API_KEY, images_dir=args.images_dir)
+    try:
+        print(f"🔭 Fetching APOD archive from {args.start} to {args.end}...")
+        entries = fetch_archive_entries(nasa, args.start, args.end)
+    finally:
+        nasa.close()
+    print(f"📚 {len(entries)} archive entries")
+
+    stats = asyncio.run(backfill_images(entries, args.images_dir, args.concurrency, args.per_host))
+
+    print("\n📊 Backfill Results:")
+    print("-" * 40)
+    print(f"✅ Downloaded: {stats['downloaded']} ({stats['bytes'] / 1024 / 1024:.1f} MB)")
+    print(f"⏭️  Already present: {stats['skipped']}")
+    if stats["failed"]:
+        print(f"❌ Failed: {stats['failed']} (run the backfill again to retry)")
+    print(f"⏱️  {stats['elapsed']:.1f}s")
+    print(f"📄 Manifest: {Config.APOD_MANIFEST_PATH}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\n👋 Backfill interrupted by user. Run it again to resume.")
@@ -0,0 +1,366 @@
+"""Local stand-ins for the Discord, Telegram, X and Facebook APIs
+
+Every platform is served under its own path prefix by one threaded HTTP
+server, answering the endpoints the poster classes use with responses shaped
+like the real ones:
+
+    /discord    Discord REST API v10 (DISCORD_API_BASE_URL)
+    /telegram   Bot API (TELEGRAM_API_BASE_URL)
+    /facebook   Graph API (FACEBOOK_GRAPH_URL)
+    /x          X API v2 and v1.1 (api.twitter.com, see route_x_poster)
+    /x-upload   X media upload (upload.twitter.com)
+
+Each platform can be given a response latency, a rate limit (posts per
+second, answered with the platform's own 429 / throttling error) and a
+payload limit (answered with the platform's "too large" error).
+"""
+
+import json
+import random
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import default as default_policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+PLATFORM_PREFIXES = {
+    "discord": "Discord",
+    "telegram": "Telegram",
+    "facebook": "Facebook",
+    "x": "X",
+    "x-upload": "X"
+}
+
+
+class PlatformBehaviour:
+    """How a fake platform responds"""
+
+    def __init__(self, latency: float = 0.05, jitter: float = 0.0, rate_limit: float = 0,
+                 max_payload: Optional[int] = None):
+        self.latency = latency  # Seconds before every response
+        self.jitter = jitter  # Extra random latency, up to this many seconds
+        self.rate_limit = rate_limit  # Posts per second, 0 for no limit
+        self.max_payload = max_payload  # Request body bytes, None for no limit
+
+
+class PlatformState:
+    """Per-platform counters and the rate limit window"""
+
+    def __init__(self, behaviour: PlatformBehaviour):
+        self.behaviour = behaviour
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.posts = 0
+        self.rate_limited = 0
+        self.too_large = 0
+        self.bytes_received = 0
+        self.next_id = 1000
+        self.allowed_at = 0.0
+
+    def new_id(self) -> int:
+        with self.lock:
+            self.next_id += 1
+            return self.next_id
+
+    def take_post_slot(self) -> float:
+        """Admit a post, returning 0 or the seconds until the rate limit allows another one"""
+        rate = self.behaviour.rate_limit
+        with self.lock:
+            if rate <= 0:
+                self.posts += 1
+                return 0.0
+
+            now = time.monotonic()
+            if now < self.allowed_at:
+                self.rate_limited += 1
+                return self.allowed_at - now
+            self.allowed_at = max(now, self.allowed_at) + 1 / rate
+            self.posts += 1
+            return 0.0
+
+
+def _form_fields(body: bytes, content_type: str) -> Dict[str, str]:
+    """Read the text fields of a urlencoded or multipart request body"""
+    if content_type.startswith("application/x-www-form-urlencoded"):
+        return {key: values[0] for key, values in parse_qs(body.decode("utf-8", "replace")).items()}
+
+    if content_type.startswith("multipart/form-data"):
+        message = BytesParser(policy=default_policy).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode("utf-8") + body
+        )
+        fields = {}
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            if name and not part.get_filename():
+                fields[name] = part.get_content().strip() if part.get_content_maintype() == "text" else ""
+        return fields
+
+    return {}
+
+
+class FakePlatformHandler(BaseHTTPRequestHandler):
+    """Routes requests to the platform handler for their path prefix"""
+
+    # Keep connections open, like the real APIs, so connection pooling is measured too
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this Nagle's algorithm adds ~40ms per response
+    disable_nagle_algorithm = True
+    server: "FakePlatformServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            body = b""
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return body
+                body += self.rfile.read(size)
+                self.rfile.readline()
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def _send_json(self, status: int, payload, headers: Dict[str, str] = None):
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.send_response(status)
+        if payload is not None:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self):
+        path = urlsplit(self.path).path
+        prefix, _, rest = path.lstrip("/").partition("/")
+        platform = PLATFORM_PREFIXES.get(prefix)
+        body = self._read_body()
+        if platform is None:
+            self._send_json(404, {"error": f"Unknown path {path}"})
+            return
+
+        state = self.server.platforms[platform]
+        with state.lock:
+            state.requests += 1
+            state.bytes_received += len(body)
+
+        behaviour = state.behaviour
+        time.sleep(behaviour.latency + random.uniform(0, behaviour.jitter))
+
+        too_large = behaviour.max_payload is not None and len(body) > behaviour.max_payload
+        if too_large:
+            with state.lock:
+                state.too_large += 1
+
+        handler = getattr(self, f"_handle_{prefix.replace('-', '_')}")
+        handler(state, "/" + rest, body, too_large)
+
+    do_GET = _handle
+    do_POST = _handle
+
+    # Discord
+
+    def _handle_discord(self, state: PlatformState, path: str, body: bytes, too_large: bool):
+        parts = path.strip("/").split("/")
+        if self.command == "GET" and len(parts) == 2 and parts[0] == "channels":
+            self._send_json(200, {"id": parts[1], "name": "benchmark", "type": 0})
+            return
+
+        if len(parts) != 3 or parts[2] != "messages":
+            self._send_json(404, {"message": "404: Not Found", "code": 0})
+            return
+        if too_large:
+            self._send_json(413, {"message": "Request entity too large", "code": 40005})
+            return
+
+        retry_after = state.take_post_slot()
+        if retry_after:
+            self._send_json(
+                429,
+                {"message": "You are being rate limited.", "retry_after": round(retry_after, 3), "global": False},
+                {"Retry-After": str(retry_after), "X-RateLimit-Remaining": "0",
+                 "X-RateLimit-Reset-After": f"{retry_after:.3f}"}
+            )
+            return
+
+        self._send_json(200, {"id": str(state.new_id()), "channel_id": parts[1], "content": ""})
+
+    # Telegram
+
+    def _telegram_message(self, state: PlatformState) -> Dict:
+        return {"message_id": state.new_id(), "date": int(time.time()), "chat": {"id": -1001, "type": "channel"}}
+
+    def _handle_telegram(self, state: PlatformState, path: str, body: bytes, too_large: bool):
+        method = path.rsplit("/", 1)[-1]
+        if method == "getMe":
+            self._send_json(200, {"ok": True, "result": {
+                "id": 1, "is_bot": True, "first_name": "Benchmark", "username": "benchmark_bot"
+            }})
+            return
+        if method not in ("sendMessage", "sendPhoto", "sendMediaGroup"):
+            self._send_json(404, {"ok": False, "error_code": 404, "description": "Not Found"})
+            return
+        if too_large:
+            self._send_json(413, {"ok": False, "error_code": 413, "description": "Request Entity Too Large"})
+            return
+
+        retry_after = state.take_post_slot()
+        if retry_after:
+            # The Bot API only announces whole seconds
+            seconds = max(1, int(retry_after + 0.999))
+            self._send_json(429, {
+                "ok": False,
+                "error_code": 429,
+                "description": f"Too Many Requests: retry after {seconds}",
+                "parameters": {"retry_after": seconds}
+            })
+            return
+
+        if method == "sendMediaGroup":
+            media = json.loads(_form_fields(body, self.headers.get("Content-Type", "")).get("media", "[]") or "[]")
+            if not 2 <= len(media) <= 10:
+                self._send_json(400, {"ok": False, "error_code": 400, "description": "Bad Request: wrong number of media"})
+                return
+            self._send_json(200, {"ok": True, "result": [self._telegram_message(state) for _ in media]})
+            return
+        self._send_json(200, {"ok": True, "result": self._telegram_message(state)})
+
+    # Facebook
+
+    def _handle_facebook(self, state: PlatformState, path: str, body: bytes, too_large: bool):
+        connection = path.rstrip("/").rsplit("/", 1)[-1]
+        if connection not in ("feed", "photos"):
+            self._send_json(400, {"error": {"message": "Unsupported request", "type": "GraphMethodException", "code": 100}})
+            return
+        if too_large:
+            self._send_json(400, {"error": {"message": "(#1) An unknown error occurred", "type": "OAuthException", "code": 1}})
+            return
+
+        if state.take_post_slot():
+            # Facebook throttles with an error code and no retry hint
+            self._send_json(400, {"error": {
+                "message": "(#4) Application request limit reached", "type": "OAuthException", "code": 4
+            }})
+            return
+
+        post_id = f"1001_{state.new_id()}"
+        if connection == "photos":
+            self._send_json(200, {"id": str(state.new_id()), "post_id": post_id})
+        else:
+            self._send_json(200, {"id": post_id})
+
+    # X
+
+    def _handle_x(self, state: PlatformState, path: str, body: bytes, too_large: bool):
+        if path.rstrip("/") != "/2/tweets":
+            self._send_json(404, {"title": "Not Found Error", "status": 404, "detail": "Not Found"})
+            return
+
+        retry_after = state.take_post_slot()
+        if retry_after:
+            self._send_json(
+                429,
+                {"title": "Too Many Requests", "detail": "Too Many Requests", "type": "about:blank", "status": 429},
+                {"x-rate-limit-remaining": "0", "x-rate-limit-reset": str(int(time.time() + retry_after + 0.999))}
+            )
+            return
+
+        text = json.loads(body or b"{}").get("text", "")
+        self._send_json(201, {"data": {"id": str(state.new_id()), "text": text, "edit_history_tweet_ids": []}})
+
+    def _handle_x_upload(self, state: PlatformState, path: str, body: bytes, too_large: bool):
+        if path != "/1.1/media/upload.json":
+            self._send_json(404, {"errors": [{"code": 34, "message": "Sorry, that page does not exist."}]})
+            return
+        if too_large:
+            self._send_json(413, {"errors": [{"code": 324, "message": "File size exceeds the limit."}]})
+            return
+
+        fields = _form_fields(body, self.headers.get("Content-Type", ""))
+        command = fields.get("command")
+        if command == "APPEND":
+            self._send_json(204, None)
+            return
+
+        media_id = int(fields.get("media_id") or state.new_id())
+        self._send_json(200, {
+            "media_id": media_id,
+            "media_id_string": str(media_id),
+            "size": len(body),
+            "expires_after_secs": 86400
+        })
+
+
+class FakePlatformServer(ThreadingHTTPServer):
+    """Threaded HTTP server emulating all platforms on one local port"""
+
+    daemon_threads = True
+
+    def __init__(self, behaviours: Dict[str, PlatformBehaviour], port: int = 0):
+        super().__init__(("127.0.0.1", port), FakePlatformHandler)
+        self.platforms = {
+            platform: PlatformState(behaviours.get(platform) or PlatformBehaviour())
+            for platform in set(PLATFORM_PREFIXES.values())
+        }
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def platform_urls(self) -> Dict[str, str]:
+        """Settings that point the posters at this server"""
+        return {
+            "DISCORD_API_BASE_URL": f"{self.base_url}/discord",
+            "TELEGRAM_API_BASE_URL": f"{self.base_url}/telegram/bot",
+            "FACEBOOK_GRAPH_URL": f"{self.base_url}/facebook/"
+        }
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="fake-platforms", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            platform: {
+                "requests": state.requests,
+                "posts": state.posts,
+                "rate_limited": state.rate_limited,
+                "too_large": state.too_large,
+                "bytes_received": state.bytes_received
+            }
+            for platform, state in self.platforms.items()
+        }
+
+
+def route_x_poster(poster, base_url: str):
+    """Send an XPoster's requests to the fake server
+
+    tweepy always talks HTTPS to api.twitter.com and upload.twitter.com, so its
+    requests sessions get an adapter that rewrites those URLs instead.
+    """
+    from requests.adapters import HTTPAdapter
+
+    class RedirectAdapter(HTTPAdapter):
+        def __init__(self, target: str):
+            super().__init__()
+            self.target = target
+
+        def send(self, request, **kwargs):
+            url = urlsplit(request.url)
+            request.url = self.target + url.path + (f"?{url.query}" if url.query else "")
+            return super().send(request, **kwargs)
+
+    for session in (poster.client.session, poster.api.session):
+        session.mount("https://api.twitter.com", RedirectAdapter(f"{base_url}/x"))
+        session.mount("https://upload.twitter.com", RedirectAdapter(f"{base_url}/x-upload"))
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Posting Benchmark
+Drives SocialMediaPoster against local fake platform servers and reports
+per-platform p50/p99 latency and throughput, so changes to the posting
+pipeline can be compared without touching the live APIs.
+
+Usage:
+  python benchmarks/posting_benchmark.py [--messages 100] [--rate 10] [--image-every 5]
+                                         [--latency 0.05] [--platform-latency X=0.3]
+                                         [--rate-limit 5] [--channels 2] [--json results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_platforms import FakePlatformServer, PlatformBehaviour, route_x_poster
+
+# Credentials the posters are configured with; the fake servers accept anything
+FAKE_SETTINGS = {
+    "TELEGRAM_BOT_TOKEN": "123456:benchmark",
+    "TELEGRAM_CHANNEL_ID": "@benchmark",
+    "DISCORD_BOT_TOKEN": "benchmark",
+    "DISCORD_CHANNEL_ID": "100000000000000001",
+    "FACEBOOK_ACCESS_TOKEN": "benchmark",
+    "FACEBOOK_GROUP_ID": "1001",
+    "X_API_KEY": "benchmark",
+    "X_API_SECRET": "benchmark",
+    "X_ACCESS_TOKEN": "benchmark",
+    "X_ACCESS_TOKEN_SECRET": "benchmark"
+}
+
+# Per-channel setting used to add extra channels with --channels
+CHANNEL_SETTINGS = {
+    "Telegram": "TELEGRAM_CHANNEL_ID",
+    "Discord": "DISCORD_CHANNEL_ID",
+    "Facebook": "FACEBOOK_GROUP_ID",
+    "X": "X_ACCESS_TOKEN"
+}
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def write_test_image(path: str, size: int):
+    """Write a size x size PNG of random noise (so it doesn't compress away)"""
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xffffffff)
+
+    rows = b"".join(b"\x00" + os.urandom(size * 3) for _ in range(size))
+    with open(path, 'wb') as image_file:
+        image_file.write(b"\x89PNG\r\n\x1a\n")
+        image_file.write(chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0)))
+        image_file.write(chunk(b"IDAT", zlib.compress(rows, 1)))
+        image_file.write(chunk(b"IEND", b""))
+
+
+def configure_environment(args, server: FakePlatformServer, data_dir: str):
+    """Point the posters at the fake servers; must run before config is imported"""
+    os.environ.update(FAKE_SETTINGS)
+    os.environ.update(server.platform_urls())
+    os.environ["ENABLED_PLATFORMS"] = ",".join(args.platforms)
+    os.environ["DATA_DIR"] = data_dir
+    os.environ["CHANNELS_FILE"] = ""
+    os.environ["POST_DELAY"] = str(args.post_delay)
+    os.environ["CONCURRENT_POSTING"] = "false" if args.sequential else "true"
+
+    for platform, setting in CHANNEL_SETTINGS.items():
+        for index in range(2, args.channels + 1):
+            os.environ[f"{setting}_{index}"] = f"{FAKE_SETTINGS[setting]}{index}"
+
+
+async def run_rounds(args, server: FakePlatformServer, image_path: str) -> Dict:
+    from social_media_poster import SocialMediaPoster
+    from posters import platform_of
+
+    async with SocialMediaPoster() as poster:
+        for platform_poster in poster.platforms.values():
+            if platform_poster.platform == "X":
+                route_x_poster(platform_poster, server.base_url)
+
+        print(f"✅ Channels: {', '.join(poster.platforms.keys())}")
+
+        padding = "x" * max(0, args.message_length - 40)
+
+        async def post_round(number: int, started_at: float):
+            if args.rate > 0:
+                await asyncio.sleep(max(0.0, started_at + number / args.rate - time.monotonic()))
+            message = f"Benchmark message #{number} {padding}"
+            with_image = image_path if args.image_every and number % args.image_every == 0 else None
+            round_started_at = time.monotonic()
+            results = await poster.post_to_all_platforms(message, with_image)
+            return time.monotonic() - round_started_at, results
+
+        # Warm-up rounds open connections, initialize bots and validate channels
+        for number in range(args.warmup):
+            await post_round(-number - 1, time.monotonic())
+
+        started_at = time.monotonic()
+        if args.rate > 0:
+            rounds = await asyncio.gather(*[post_round(number, started_at) for number in range(args.messages)])
+        else:
+            rounds = [await post_round(number, started_at) for number in range(args.messages)]
+        elapsed = time.monotonic() - started_at
+
+    platforms: Dict[str, Dict] = {}
+    for _, results in rounds:
+        for result in results:
+            stats = platforms.setdefault(platform_of(result["platform"]), {
+                "latencies": [], "succeeded": 0, "failed": 0, "retries": 0
+            })
+            stats["latencies"].append(result.get("elapsed", 0.0))
+            stats["succeeded" if result["success"] else "failed"] += 1
+            stats["retries"] += max(0, result.get("attempts", 1) - 1)
+
+    round_latencies = [round_elapsed for round_elapsed, _ in rounds]
+    posts = sum(stats["succeeded"] + stats["failed"] for stats in platforms.values())
+    return {
+        "messages": args.messages,
+        "elapsed": elapsed,
+        "messages_per_second": args.messages / elapsed if elapsed > 0 else 0.0,
+        "posts_per_second": posts / elapsed if elapsed > 0 else 0.0,
+        "round_p50": percentile(round_latencies, 50),
+        "round_p99": percentile(round_latencies, 99),
+        "platforms": {
+            platform: {
+                "posts": len(stats["latencies"]),
+                "succeeded": stats["succeeded"],
+                "failed": stats["failed"],
+                "retries": stats["retries"],
+                "p50": percentile(stats["latencies"], 50),
+                "p99": percentile(stats["latencies"], 99),
+                "max": max(stats["latencies"])
+            }
+            for platform, stats in platforms.items()
+        },
+        "server": server.stats()
+    }
+
+
+def print_report(report: Dict):
+    print("\n📊 Benchmark Results:")
+    print("-" * 72)
+    print(f"{'Platform':<10} {'Posts':>6} {'OK':>6} {'Failed':>6} {'Retries':>7} {'p50':>9} {'p99':>9} {'max':>9}")
+    for platform, stats in sorted(report["platforms"].items(), key=lambda item: item[1]["p99"], reverse=True):
+        print(
+            f"{platform:<10} {stats['posts']:>6} {stats['succeeded']:>6} {stats['failed']:>6} {stats['retries']:>7} "
+            f"{stats['p50'] * 1000:>7.1f}ms {stats['p99'] * 1000:>7.1f}ms {stats['max'] * 1000:>7.1f}ms"
+        )
+    print("-" * 72)
+    print(f"📨 Rounds: {report['messages']} in {report['elapsed']:.2f}s "
+          f"(p50 {report['round_p50'] * 1000:.1f}ms, p99 {report['round_p99'] * 1000:.1f}ms)")
+    print(f"⚡ Throughput: {report['messages_per_second']:.2f} messages/s, {report['posts_per_second']:.2f} posts/s")
+
+    print("\n🖥️  Fake server:")
+    for platform, stats in report["server"].items():
+        if stats["requests"]:
+            print(f"{platform}: {stats['requests']} requests, {stats['rate_limited']} rate limited, "
+                  f"{stats['too_large']} too large, {stats['bytes_received'] / 1024:.0f} KB received")
+
+
+def parse_platform_values(values: List[str]) -> Dict[str, float]:
+    """Parse repeated Platform=value options"""
+    parsed = {}
+    for value in values or []:
+        platform, _, number = value.partition("=")
+        parsed[platform] = float(number)
+    return parsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark posting against local fake platform servers")
+    parser.add_argument("--messages", type=int, default=50, help="Messages to post (default: 50)")
+    parser.add_argument("--rate", type=float, default=0,
+                        help="Messages started per second; 0 posts them one round after another (default: 0)")
+    parser.add_argument("--sequential", action="store_true", help="Post to platforms one after another")
+    parser.add_argument("--image-every", type=int, default=0, help="Attach an image to every Nth message (default: none)")
+    parser.add_argument("--image-size", type=int, default=512, help="Test image width and height in pixels (default: 512)")
+    parser.add_argument("--message-length", type=int, default=200, help="Message length in characters (default: 200)")
+    parser.add_argument("--platforms", default="Telegram,Discord,X,Facebook", help="Comma-separated platforms")
+    parser.add_argument("--channels", type=int, default=1, help="Channels per platform (default: 1)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake server response latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Extra random latency in seconds")
+    parser.add_argument("--platform-latency", action="append", metavar="PLATFORM=SECONDS",
+                        help="Latency for one platform, e.g. X=0.3 (repeatable)")
+    parser.add_argument("--rate-limit", type=float, default=0, help="Posts per second each fake platform accepts")
+    parser.add_argument("--max-payload", type=int, help="Request body limit in bytes for every fake platform")
+    parser.add_argument("--post-delay", type=float, default=0, help="POST_DELAY used by the posters (default: 0)")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed rounds before measuring (default: 1)")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+    args.platforms = [platform.strip() for platform in args.platforms.split(",") if platform.strip()]
+
+    platform_latency = parse_platform_values(args.platform_latency)
+    behaviours = {
+        platform: PlatformBehaviour(
+            latency=platform_latency.get(platform, args.latency),
+            jitter=args.jitter,
+            rate_limit=args.rate_limit,
+            max_payload=args.max_payload
+        )
+        for platform in CHANNEL_SETTINGS
+    }
+
+    server = FakePlatformServer(behaviours)
+    server.start()
+    print(f"🖥️  Fake platforms listening on {server.base_url}")
+
+    with tempfile.TemporaryDirectory(prefix="smm-benchmark-") as data_dir:
+        configure_environment(args, server, data_dir)
+        image_path = None
+        if args.image_every:
+            image_path = os.path.join(data_dir, "benchmark.png")
+            write_test_image(image_path, args.image_size)
+            print(f"🖼️  Test image: {args.image_size}x{args.image_size}, {os.path.getsize(image_path) / 1024:.0f} KB")
+
+        try:
+            report = asyncio.run(run_rounds(args, server, image_path))
+        finally:
+            server.stop()
+
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as json_file:
+            json.dump(report, json_file, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\n👋 Benchmark interrupted by user.")
@@ -8,14 +8,21 @@ class Config:
     # Telegram Configuration
     TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
     TELEGRAM_CHANNEL_ID = os.getenv('TELEGRAM_CHANNEL_ID')
+    TELEGRAM_POOL_SIZE = int(os.getenv('TELEGRAM_POOL_SIZE', '8'))  # Max open connections to the Bot API
+    TELEGRAM_API_BASE_URL = os.getenv('TELEGRAM_API_BASE_URL', 'https://api.telegram.org/bot')  # Or a local Bot API server
     
     # Discord Configuration
     DISCORD_BOT_TOKEN = os.getenv('DISCORD_BOT_TOKEN')
     DISCORD_CHANNEL_ID = os.getenv('DISCORD_CHANNEL_ID')
+    DISCORD_POOL_SIZE = int(os.getenv('DISCORD_POOL_SIZE', '10'))  # Max open connections to the Discord API
+    DISCORD_DNS_CACHE_TTL = int(os.getenv('DISCORD_DNS_CACHE_TTL', '300'))  # Seconds to cache DNS lookups
+    DISCORD_VALIDATION_TTL = int(os.getenv('DISCORD_VALIDATION_TTL', '3600'))  # Seconds a channel check stays valid
+    DISCORD_API_BASE_URL = os.getenv('DISCORD_API_BASE_URL', 'https://discord.com/api/v10')
     
     # Facebook Configuration
     FACEBOOK_ACCESS_TOKEN = os.getenv('FACEBOOK_ACCESS_TOKEN')
     FACEBOOK_GROUP_ID = os.getenv('FACEBOOK_GROUP_ID')
+    FACEBOOK_GRAPH_URL = os.getenv('FACEBOOK_GRAPH_URL', 'https://graph.facebook.com/')
     
     # X (Twitter) Configuration
     X_API_KEY = os.getenv('X_API_KEY')
@@ -23,6 +30,8 @@ class Config:
     X_ACCESS_TOKEN = os.getenv('X_ACCESS_TOKEN')
     X_ACCESS_TOKEN_SECRET = os.getenv('X_ACCESS_TOKEN_SECRET')
     X_BEARER_TOKEN = os.getenv('X_BEARER_TOKEN')
+    X_CHUNKED_UPLOAD_THRESHOLD = int(os.getenv('X_CHUNKED_UPLOAD_THRESHOLD', str(1024 * 1024)))  # Bytes
+    X_MEDIA_ID_TTL = int(os.getenv('X_MEDIA_ID_TTL', str(23 * 60 * 60)))  # X media IDs expire after 24 hours
     
     # NASA APOD Configuration
     NASA_API_KEY = os.getenv('NASA_API_KEY')
@@ -31,19 +40,92 @@ class Config:
     POST_DELAY = int(os.getenv('POST_DELAY', '5'))  # Delay between posts in seconds
     MAX_RETRIES = int(os.getenv('MAX_RETRIES', '3'))
     
+    # Rate limiting and retry configuration
+    RATE_LIMIT_BURST = int(os.getenv('RATE_LIMIT_BURST', '1'))  # Posts allowed back-to-back per platform
+    RETRY_BASE_DELAY = float(os.getenv('RETRY_BASE_DELAY', '2'))  # Seconds, doubled on every retry
+    RETRY_MAX_DELAY = float(os.getenv('RETRY_MAX_DELAY', '300'))  # Longer rate limit waits fail fast instead
+    
+    # Concurrent posting configuration
+    CONCURRENT_POSTING = os.getenv('CONCURRENT_POSTING', 'true').lower() == 'true'
+    SYNC_POST_WORKERS = int(os.getenv('SYNC_POST_WORKERS', '4'))  # Thread pool size for sync SDKs
+    
+    # Outbox (batch posting queue) configuration
+    DATA_DIR = os.getenv('DATA_DIR', 'data')
+    OUTBOX_DB_PATH = os.getenv('OUTBOX_DB_PATH', os.path.join(DATA_DIR, 'outbox.db'))
+    OUTBOX_PLATFORM_CONCURRENCY = int(os.getenv('OUTBOX_PLATFORM_CONCURRENCY', '2'))  # Drain workers per channel
+    
+    # Duplicate post protection
+    POST_DEDUP = os.getenv('POST_DEDUP', 'true').lower() == 'true'  # Skip posts already sent to a platform
+    POST_INDEX_PATH = os.getenv('POST_INDEX_PATH', os.path.join(DATA_DIR, 'post_index.db'))
+    
+    # Resized copies of images that are too large for a platform
+    IMAGE_VARIANTS_DIR = os.getenv('IMAGE_VARIANTS_DIR', os.path.join(DATA_DIR, 'image_variants'))
+    
+    # Multi-channel configuration
+    CHANNELS_FILE = os.getenv('CHANNELS_FILE', 'channels.yaml')  # Extra channels per platform (YAML)
+    PLATFORM_CONCURRENCY = int(os.getenv('PLATFORM_CONCURRENCY', '8'))  # In-flight posts per platform
+    
+    # NASA APOD response cache
+    APOD_CACHE = os.getenv('APOD_CACHE', 'true').lower() == 'true'
+    APOD_CACHE_PATH = os.getenv('APOD_CACHE_PATH', os.path.join(DATA_DIR, 'apod_cache.db'))
+    APOD_DOWNLOADS_PATH = os.getenv('APOD_DOWNLOADS_PATH', os.path.join(DATA_DIR, 'apod_downloads.db'))  # ETags for resume
+    APOD_MANIFEST_PATH = os.getenv('APOD_MANIFEST_PATH', os.path.join(DATA_DIR, 'apod_manifest.jsonl'))
+    APOD_BACKFILL_CONCURRENCY = int(os.getenv('APOD_BACKFILL_CONCURRENCY', '8'))  # Archive downloads at once
+    APOD_BACKFILL_PER_HOST = int(os.getenv('APOD_BACKFILL_PER_HOST', '4'))  # Connections per image host
+    
+    # Image pool (images/ folder index used to pick images to post)
+    IMAGE_POOL_PATH = os.getenv('IMAGE_POOL_PATH', os.path.join(DATA_DIR, 'image_pool.db'))
+    IMAGE_POOL_LRU_DAYS = float(os.getenv('IMAGE_POOL_LRU_DAYS', '90'))  # Days after which a posted image is fully eligible again
+    DELETE_POSTED_IMAGES = os.getenv('DELETE_POSTED_IMAGES', 'false').lower() == 'true'
+    DAILY_IMAGE_COUNT = int(os.getenv('DAILY_IMAGE_COUNT', '1'))  # Images with the daily message, >1 posts an album
+    IMAGE_DEDUP_DAYS = float(os.getenv('IMAGE_DEDUP_DAYS', '30'))  # Reject look-alikes of images posted this recently, 0 disables
+    IMAGE_DEDUP_DISTANCE = int(os.getenv('IMAGE_DEDUP_DISTANCE', '6'))  # Max differing bits (of 64) for a near-duplicate
+    
+    # AI content generation (Google Gemini)
+    GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-2.5-flash')
+    GEMINI_RETRY_MAX_DELAY = float(os.getenv('GEMINI_RETRY_MAX_DELAY', '60'))  # Longer retry hints fail fast instead
+    GEMINI_BATCH_SIZE = int(os.getenv('GEMINI_BATCH_SIZE', '5'))  # Posts asked for per request when filling the buffer
+    GEMINI_CACHE = os.getenv('GEMINI_CACHE', 'false').lower() == 'true'  # Reuse responses to identical requests (dev/staging)
+    GEMINI_CACHE_REFRESH = os.getenv('GEMINI_CACHE_REFRESH', 'false').lower() == 'true'  # Ignore cached responses
+    GEMINI_CACHE_PATH = os.getenv('GEMINI_CACHE_PATH', os.path.join(DATA_DIR, 'gemini_cache.db'))
+    GEMINI_CACHE_TTL = float(os.getenv('GEMINI_CACHE_TTL', '86400'))  # Seconds a cached response stays valid
+    GEMINI_CACHE_MAX_ENTRIES = int(os.getenv('GEMINI_CACHE_MAX_ENTRIES', '256'))  # Least recently used evicted beyond this
+    CONTENT_BUFFER_PATH = os.getenv('CONTENT_BUFFER_PATH', os.path.join(DATA_DIR, 'content_buffer.db'))
+    CONTENT_BUFFER_SIZE = int(os.getenv('CONTENT_BUFFER_SIZE', '5'))  # Pre-generated messages per type, 0 disables
+    CONTENT_BUFFER_QUOTA_COOLDOWN = int(os.getenv('CONTENT_BUFFER_QUOTA_COOLDOWN', '3600'))  # Seconds to pause refills
+    CONTENT_BUFFER_REFILL_TIMEOUT = float(os.getenv('CONTENT_BUFFER_REFILL_TIMEOUT', '120'))  # Max wait at the end of a run
+    
+    # Posting metrics
+    METRICS_FILE = os.getenv('METRICS_FILE', '')  # Empty disables the export
+    METRICS_FORMAT = os.getenv('METRICS_FORMAT', 'prometheus')  # prometheus or jsonl
+    
     @classmethod
-    def validate_config(cls):
-        """Validate that all required configuration is present"""
-        required_configs = {
-            'Telegram': [cls.TELEGRAM_BOT_TOKEN, cls.TELEGRAM_CHANNEL_ID],
-            'Discord': [cls.DISCORD_BOT_TOKEN, cls.DISCORD_CHANNEL_ID],
-            'Facebook': [cls.FACEBOOK_ACCESS_TOKEN, cls.FACEBOOK_GROUP_ID],
-            'X': [cls.X_API_KEY, cls.X_API_SECRET, cls.X_ACCESS_TOKEN, cls.X_ACCESS_TOKEN_SECRET]
-        }
-        
-        missing_configs = []
-        for platform, configs in required_configs.items():
-            if not all(configs):
-                missing_configs.append(platform)
-        
-        return missing_configs
+    def get_platform_concurrency(cls, platform):
+        """Get the max in-flight posts for a platform (e.g. X_CONCURRENCY), falling back to PLATFORM_CONCURRENCY"""
+        platform_concurrency = os.getenv(f'{platform.upper()}_CONCURRENCY')
+        if platform_concurrency:
+            return int(platform_concurrency)
+        return cls.PLATFORM_CONCURRENCY
+    
+    @classmethod
+    def get_post_delay(cls, platform):
+        """Get the delay between posts for a platform (e.g. X_POST_DELAY), falling back to POST_DELAY"""
+        platform_delay = os.getenv(f'{platform.upper()}_POST_DELAY')
+        if platform_delay:
+            return float(platform_delay)
+        return cls.POST_DELAY
+    
+    # Platforms to post to; Facebook is opt-in (add it here once the group app is approved)
+    ENABLED_PLATFORMS = [
+        platform.strip()
+        for platform in os.getenv('ENABLED_PLATFORMS', 'Telegram,Discord,X').split(',')
+        if platform.strip()
+    ]
+    
+    # Settings each built-in platform needs; read them through the poster registry (posters.required_settings)
+    PLATFORM_SETTINGS = {
+        'Telegram': ['TELEGRAM_BOT_TOKEN', 'TELEGRAM_CHANNEL_ID'],
+        'Discord': ['DISCORD_BOT_TOKEN', 'DISCORD_CHANNEL_ID'],
+        'Facebook': ['FACEBOOK_ACCESS_TOKEN', 'FACEBOOK_GROUP_ID'],
+        'X': ['X_API_KEY', 'X_API_SECRET', 'X_ACCESS_TOKEN', 'X_ACCESS_TOKEN_SECRET']
+    }
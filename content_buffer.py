@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""On-disk buffer of pre-generated messages
+
+Generated messages are kept in a SQLite database, up to CONTENT_BUFFER_SIZE
+per message type, so a posting run can take a ready message instead of
+waiting on Gemini. The buffer is refilled in the background while posting
+(see ContentGenerator.start_refill) or from cron with this script. When the
+Gemini quota runs out, refilling pauses for CONTENT_BUFFER_QUOTA_COOLDOWN
+seconds and the buffered messages absorb the gap.
+
+Usage:
+  python content_buffer.py [--types 1,2] [--size 5]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, Optional
+from config import Config
+from utils import open_sqlite
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    msg_type INTEGER NOT NULL,
+    content TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_messages_type ON messages (msg_type, id);
+
+CREATE TABLE IF NOT EXISTS buffer_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class ContentBuffer:
+    """SQLite-backed FIFO of ready-to-post messages per message type"""
+
+    def __init__(self, db_path: str = None, size: int = None):
+        self.db_path = db_path or Config.CONTENT_BUFFER_PATH
+        self.size = size if size is not None else Config.CONTENT_BUFFER_SIZE
+        self.conn = open_sqlite(self.db_path, SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def add(self, msg_type: int, content: str):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO messages (msg_type, content, created_at) VALUES (?, ?, ?)",
+                (msg_type, content, time.time())
+            )
+
+    def take(self, msg_type: int) -> Optional[str]:
+        """Remove and return the oldest buffered message of this type, if any"""
+        with self.conn:
+            row = self.conn.execute(
+                "SELECT id, content FROM messages WHERE msg_type = ? ORDER BY id LIMIT 1", (msg_type,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("DELETE FROM messages WHERE id = ?", (row["id"],))
+        return row["content"]
+
+    def contains(self, msg_type: int, content: str) -> bool:
+        return self.conn.execute(
+            "SELECT 1 FROM messages WHERE msg_type = ? AND content = ?", (msg_type, content)
+        ).fetchone() is not None
+
+    def count(self, msg_type: int) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM messages WHERE msg_type = ?", (msg_type,)).fetchone()[0]
+
+    def missing(self, msg_type: int) -> int:
+        """How many messages of this type are needed to fill the buffer"""
+        return max(0, self.size - self.count(msg_type))
+
+    def stats(self) -> Dict[int, int]:
+        """Buffered messages per message type"""
+        return {
+            row["msg_type"]: row["messages"]
+            for row in self.conn.execute("SELECT msg_type, COUNT(*) AS messages FROM messages GROUP BY msg_type")
+        }
+
+    def refill_paused_until(self) -> float:
+        row = self.conn.execute("SELECT value FROM buffer_state WHERE key = 'refill_paused_until'").fetchone()
+        return float(row["value"]) if row else 0.0
+
+    def pause_refill(self, seconds: float):
+        """Stop refilling for a while, e.g. after running out of quota"""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO buffer_state (key, value) VALUES ('refill_paused_until', ?)",
+                (str(time.time() + seconds),)
+            )
+
+
+async def refill_buffer(buffer: ContentBuffer, generator, msg_types: Iterable[int]) -> int:
+    """Generate messages until every type is buffered up to the buffer size, returning how many were added
+
+    Stops at the first generation that fails after its retries (usually because the quota is
+    exhausted) and pauses refilling for CONTENT_BUFFER_QUOTA_COOLDOWN seconds.
+    """
+    paused_until = buffer.refill_paused_until()
+    if time.time() < paused_until:
+        logger.info(f"Content buffer refill paused for another {paused_until - time.time():.0f}s")
+        return 0
+
+    added = 0
+    for msg_type in msg_types:
+        while buffer.missing(msg_type) > 0:
+            # Several posts per request, so a refill costs a fraction of the API calls. The response
+            # cache is bypassed: a cached response would put the same posts in the buffer again.
+            batch_size = min(buffer.missing(msg_type), Config.GEMINI_BATCH_SIZE)
+            candidates = await generator.generate_batch(msg_type, batch_size, use_cache=False)
+            if not candidates:
+                logger.warning(f"Content buffer refill stopped after {added} messages, "
+                               f"pausing for {Config.CONTENT_BUFFER_QUOTA_COOLDOWN}s")
+                buffer.pause_refill(Config.CONTENT_BUFFER_QUOTA_COOLDOWN)
+                return added
+            new_candidates = [content for content in candidates if not buffer.contains(msg_type, content)]
+            if not new_candidates:
+                logger.warning(f"Content buffer refill for message type {msg_type} only got posts already buffered")
+                break
+            for content in new_candidates:
+                buffer.add(msg_type, content)
+            added += len(new_candidates)
+    return added
+
+
+async def fill(msg_types: Iterable[int], size: int = None) -> int:
+    from content_generator import ContentGenerator
+
+    async with ContentGenerator(buffer_size=size) as generator:
+        if generator.buffer is None:
+            return 0
+        return await refill_buffer(generator.buffer, generator, msg_types)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill the buffer of pre-generated messages")
+    parser.add_argument("--types", default="1,2", help="Comma-separated message types (default: 1,2)")
+    parser.add_argument("--size", type=int, help="Messages to keep per type (default: CONTENT_BUFFER_SIZE)")
+    args = parser.parse_args()
+    msg_types = [int(msg_type) for msg_type in args.types.split(",") if msg_type.strip()]
+
+    added = asyncio.run(fill(msg_types, args.size))
+    print(f"🤖 Generated {added} messages")
+    with ContentBuffer(size=args.size) as buffer:
+        stats = buffer.stats()
+    for msg_type in msg_types:
+        print(f"📦 Type {msg_type}: {stats.get(msg_type, 0)} buffered")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\n👋 Refill interrupted by user.")
@@ -0,0 +1,158 @@
+"""Long-lived async Gemini content generation
+
+One ContentGenerator owns the Gemini client for a whole run and generates
+messages with its async API, so generation never blocks the event loop.
+Messages can be started ahead of time with prefetch(): the next message is
+generated while the current one is being posted, making a run take about
+max(generation, posting) instead of their sum.
+
+With a content buffer (CONTENT_BUFFER_SIZE > 0) posting takes pre-generated
+messages from disk and never waits on Gemini; start_refill() tops the buffer
+up in the background while the run is posting, asking for up to
+GEMINI_BATCH_SIZE posts per request.
+
+With GEMINI_CACHE=true responses are cached by (model, prompt, generation
+config), see response_cache; GEMINI_CACHE_REFRESH=true (or fresh=True)
+skips cached responses and replaces them. Buffer refills never use the
+cache, since every buffered message has to be a new one.
+"""
+
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional
+from config import Config
+from content_buffer import ContentBuffer, refill_buffer
+from gemini_retry import async_call_with_retry
+from gg_example import PROMPTS, batch_prompt, get_client, split_candidates
+from response_cache import ResponseCache, make_cache_key
+
+logger = logging.getLogger(__name__)
+
+
+class ContentGenerator:
+    """Async Gemini message generation with background prefetching, one client per process"""
+
+    def __init__(self, model: str = None, buffer_size: int = None, generation_config: Dict = None,
+                 use_cache: bool = None, fresh: bool = None):
+        self.model = model or Config.GEMINI_MODEL
+        self.generation_config = generation_config
+        self.client = get_client()
+        self._pending: Dict[int, asyncio.Task] = {}
+        self._refill_task: Optional[asyncio.Task] = None
+
+        buffer_size = buffer_size if buffer_size is not None else Config.CONTENT_BUFFER_SIZE
+        self.buffer = ContentBuffer(size=buffer_size) if buffer_size > 0 else None
+
+        if use_cache is None:
+            use_cache = Config.GEMINI_CACHE
+        self.cache = ResponseCache() if use_cache else None
+        self.fresh = fresh if fresh is not None else Config.GEMINI_CACHE_REFRESH
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Cancel messages that were prefetched but never used and let the buffer refill finish"""
+        pending = list(self._pending.values())
+        self._pending.clear()
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        if self._refill_task is not None:
+            try:
+                added = await asyncio.wait_for(self._refill_task, Config.CONTENT_BUFFER_REFILL_TIMEOUT)
+                logger.info(f"Content buffer refilled with {added} messages")
+            except asyncio.TimeoutError:
+                logger.warning(f"Content buffer refill stopped after {Config.CONTENT_BUFFER_REFILL_TIMEOUT}s")
+            except Exception as e:
+                logger.error(f"Content buffer refill failed: {e}")
+            self._refill_task = None
+
+        if self.buffer is not None:
+            self.buffer.close()
+            self.buffer = None
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+
+    async def _generate_text(self, prompt: str, use_cache: bool = True) -> Optional[str]:
+        """Run a prompt (or answer it from the response cache); None if it failed, see gemini_retry"""
+        cache = self.cache if use_cache else None
+        cache_key = make_cache_key(self.model, prompt, self.generation_config)
+        if cache is not None and not self.fresh:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Using cached Gemini response {cache_key[:12]}")
+                return cached
+
+        try:
+            response = await async_call_with_retry(lambda: self.client.aio.models.generate_content(
+                model=self.model,
+                contents=[prompt],
+                config=self.generation_config
+            ))
+        except Exception as e:
+            logger.error(f"Gemini request failed: {e}")
+            return None
+
+        if not response.text:
+            return None
+        if cache is not None:
+            cache.store(cache_key, self.model, response.text)
+        return response.text
+
+    async def generate(self, msg_type: int, use_cache: bool = True) -> Optional[str]:
+        """Generate a message of the given type; None if generation failed"""
+        return await self._generate_text(PROMPTS[msg_type], use_cache)
+
+    async def generate_batch(self, msg_type: int, count: int, use_cache: bool = True) -> List[str]:
+        """Generate up to `count` different messages of the given type with one request
+
+        The model may return fewer posts than asked for; nothing is returned if generation failed.
+        """
+        if count <= 1:
+            content = await self.generate(msg_type, use_cache)
+            return [content] if content else []
+
+        text = await self._generate_text(batch_prompt(msg_type, count), use_cache)
+        if text is None:
+            return []
+        return split_candidates(text)[:count]
+
+    def prefetch(self, msg_type: int) -> Optional[asyncio.Task]:
+        """Start generating a message in the background (once per type until it's used)
+
+        Nothing is generated if a buffered message of this type is ready.
+        """
+        if self.buffer is not None and self.buffer.count(msg_type):
+            return None
+        task = self._pending.get(msg_type)
+        if task is None:
+            task = asyncio.create_task(self.generate(msg_type))
+            self._pending[msg_type] = task
+        return task
+
+    async def next_message(self, msg_type: int) -> Optional[str]:
+        """Get a message of this type: the prefetched one, else a buffered one, else a newly generated one
+
+        A failed generation falls back to the buffer, so a Gemini outage only fails the
+        message once the buffer runs dry.
+        """
+        task = self._pending.pop(msg_type, None)
+        content = await task if task is not None else None
+        if content is None and self.buffer is not None:
+            content = self.buffer.take(msg_type)
+        if content is None and task is None:
+            content = await self.generate(msg_type)
+        return content
+
+    def start_refill(self, msg_types: Iterable[int]) -> Optional[asyncio.Task]:
+        """Top up the content buffer in the background; close() waits for it to finish"""
+        if self.buffer is None or self._refill_task is not None:
+            return None
+        self._refill_task = asyncio.create_task(refill_buffer(self.buffer, self, list(msg_types)))
+        return self._refill_task
@@ -0,0 +1,91 @@
+"""Retry policy for Gemini requests
+
+Transient failures (API errors with a rate limit, timeout or server error
+status, and network errors or timeouts) are retried up to MAX_RETRIES times with exponential backoff and full jitter
+(rate_limiter.backoff_delay). A retry delay hint from the server (RetryInfo
+in the error details or a Retry-After header) is the minimum wait. If the
+hint is longer than GEMINI_RETRY_MAX_DELAY (e.g. the daily quota is used
+up), the request fails straight away so callers can fall back to the
+content buffer instead of blocking the run. Any other error (a bad request,
+or a bug such as a TypeError) is raised straight away.
+"""
+
+import asyncio
+import logging
+import re
+from typing import Awaitable, Callable, Optional, TypeVar
+import aiohttp
+import httpx
+from google.genai import errors
+from config import Config
+from rate_limiter import backoff_delay
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_CODES = {408, 429, 500, 502, 503, 504}
+
+# Network failures of the HTTP clients google-genai uses (httpx, or aiohttp for the async API)
+NETWORK_ERRORS = (httpx.TransportError, aiohttp.ClientError, asyncio.TimeoutError, TimeoutError, ConnectionError)
+
+
+def retry_delay_hint(error: Exception) -> Optional[float]:
+    """Get the seconds the server asked us to wait before retrying, if it did"""
+    details = getattr(error, "details", None)
+    if isinstance(details, dict):
+        for detail in (details.get("error") or {}).get("details") or []:
+            delay = detail.get("retryDelay") if isinstance(detail, dict) else None
+            if delay:
+                try:
+                    return float(str(delay).rstrip("s"))
+                except ValueError:
+                    pass
+
+    response = getattr(error, "response", None)
+    retry_after = getattr(response, "headers", {}).get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+
+    match = re.search(r"retry in ([\d.]+)\s*s", str(getattr(error, "message", None) or error), re.IGNORECASE)
+    return float(match.group(1)) if match else None
+
+
+def is_retryable(error: Exception) -> bool:
+    """API errors with a status in RETRYABLE_CODES and network errors are retryable, nothing else is"""
+    if isinstance(error, errors.APIError):
+        return error.code in RETRYABLE_CODES
+    return isinstance(error, NETWORK_ERRORS)
+
+
+def _retry_delay(error: Exception, attempt: int) -> Optional[float]:
+    """Get the delay before the next attempt, or None to give up"""
+    if attempt >= Config.MAX_RETRIES or not is_retryable(error):
+        return None
+    hint = retry_delay_hint(error)
+    if hint is not None and hint > Config.GEMINI_RETRY_MAX_DELAY:
+        logger.warning(f"Gemini asked to retry in {hint:.0f}s, not waiting that long")
+        return None
+    return backoff_delay(attempt, hint, max_delay=Config.GEMINI_RETRY_MAX_DELAY)
+
+
+async def async_call_with_retry(call: Callable[[], Awaitable[T]]) -> T:
+    """Run a Gemini request, retrying transient failures; raises the last error when giving up
+
+    `call` returns a new awaitable for every attempt.
+    """
+    attempt = 0
+    while True:
+        try:
+            return await call()
+        except Exception as e:
+            delay = _retry_delay(e, attempt)
+            if delay is None:
+                raise
+            attempt += 1
+            logger.warning(f"Gemini request failed ({e}), retrying in {delay:.1f}s "
+                           f"(attempt {attempt} of {Config.MAX_RETRIES})")
+            await asyncio.sleep(delay)
@@ -1,10 +1,45 @@
-import time
+import asyncio
 import os
 import re
 from datetime import datetime
+from typing import Optional
 from google import genai
 from utils import get_api_key
 
+PROMPTS = {
+    1: ("create well psychologically attractive and very "
+        "persuasive conclusive document about investment to the "
+        "Moon Lunar like the  one of the best "
+        "investment in to the future. The document should "
+        "contain randomly from 120 to 170 words, should "
+        "be SEO optimised, must has hashtags, include the "
+        "project web page https://moonhome.agency/"),
+    2: ("can you create a simple history of the Moon Lunar "
+        "colony day. The history should contain the genetic "
+        "investigation, gathering resources, looking for the "
+        "space around, constructing the new buildings. In the "
+        "history should be described some persons pioneers with "
+        "their name and the jobs that they are doing, The all "
+        "history should not be more than 200 words. At the end "
+        "of the history should be provided some useful SEO "
+        "optimised hashtags.")
+}
+
+HELPER_FILE = "smm_message.md"
+
+# Line separating the posts of a batch response (see batch_prompt)
+BATCH_SEPARATOR = "====="
+
+_client = None
+
+
+def get_client() -> genai.Client:
+    """Get the Gemini client shared by the whole process (created on first use)"""
+    global _client
+    if _client is None:
+        _client = genai.Client(api_key=get_api_key())
+    return _client
+
 
 def parse_content_and_tags(content):
     """Parse content and extract hashtags"""
@@ -38,6 +73,23 @@ def parse_content_and_tags(content):
     return main_content, tags_line
 
 
+def batch_prompt(msg_type, count):
+    """Prompt for `count` different posts of a message type in one response"""
+    return (f"{PROMPTS[msg_type]}\n\nWrite {count} different versions of this, each complete "
+            f"with its own hashtags. Separate the versions with a line containing only "
+            f"{BATCH_SEPARATOR} and don't number or title them.")
+
+
+def split_candidates(text):
+    """Split a batch response into separate posts, dropping any without content"""
+    candidates = []
+    for candidate in re.split(rf"^\s*{BATCH_SEPARATOR}\s*$", text, flags=re.MULTILINE):
+        main_content, _ = parse_content_and_tags(candidate)
+        if main_content:
+            candidates.append(candidate.strip())
+    return candidates
+
+
 def create_sql_file(content):
     """Create SQL file with current content and timestamp"""
     try:
@@ -105,64 +157,42 @@ def update_news_file(content):
         return None
 
 
-def create_new_message(msg_type):
-    client = genai.Client(api_key=get_api_key())
-
-    if msg_type == 1:
-        prompt = ("create well psychologically attractive and very "
-                  "persuasive conclusive document about investment to the "
-                  "Moon Lunar like the  one of the best "
-                  "investment in to the future. The document should "
-                  "contain randomly from 120 to 170 words, should "
-                  "be SEO optimised, must has hashtags, include the "
-                  "project web page https://moonhome.agency/")
-    elif msg_type == 2:
-        prompt = ("can you create a simple history of the Moon Lunar "
-                  "colony day. The history should contain the genetic "
-                  "investigation, gathering resources, looking for the "
-                  "space around, constructing the new buildings. In the "
-                  "history should be described some persons pioneers with "
-                  "their name and the jobs that they are doing, The all "
-                  "history should not be more than 200 words. At the end "
-                  "of the history should be provided some useful SEO "
-                  "optimised hashtags.")
-
-    helper_file = "smm_message.md"
-
-    response = None
-    while not response:
-        last_err = None
-        try:
-            response = client.models.generate_content(
-                model="gemini-2.5-flash",
-                contents=[prompt,],
-            )
-        except Exception as exc:
-            last_err = exc
-
-        if response:
-            with open(helper_file, "w", encoding="utf-8") as file_to_save:
-                file_to_save.write(response.text)
-
-            print(response.text)
-            
-            # Create SQL file for database insertion
-            sql_file = create_sql_file(response.text)
-            if sql_file:
-                print(f"🎉 Successfully created SQL file: {sql_file}")
-            else:
-                print("⚠️  Failed to create SQL file")
-
-            updated_file = update_news_file(response.text)
-            if updated_file:
-                print(f"🎉 Successfully Updated News file: {updated_file}")
-            else:
-                print("⚠️  Failed to Update News file")
-        else:
-            print(f'{last_err.code} Error')
-            if last_err.code == 429:
-                print(last_err.message)
-                break
-            else:
-                print("waiting 30 sec...")
-                time.sleep(30)
+def save_message(content):
+    """Write a generated message to smm_message.md, a SQL file and the news file"""
+    with open(HELPER_FILE, "w", encoding="utf-8") as file_to_save:
+        file_to_save.write(content)
+
+    print(content)
+    
+    # Create SQL file for database insertion
+    sql_file = create_sql_file(content)
+    if sql_file:
+        print(f"🎉 Successfully created SQL file: {sql_file}")
+    else:
+        print("⚠️  Failed to create SQL file")
+
+    updated_file = update_news_file(content)
+    if updated_file:
+        print(f"🎉 Successfully Updated News file: {updated_file}")
+    else:
+        print("⚠️  Failed to Update News file")
+
+
+def create_new_message(msg_type, fresh=None) -> Optional[str]:
+    """Generate a message and save it (see save_message); None if generation failed
+
+    A blocking wrapper around ContentGenerator for callers without an event loop, so
+    messages are generated, cached and taken from the content buffer the same way as
+    in simple_poster. `fresh` skips cached responses (default: GEMINI_CACHE_REFRESH).
+    """
+    # Imported here: content_generator imports this module
+    from content_generator import ContentGenerator
+
+    async def generate():
+        async with ContentGenerator(fresh=fresh) as generator:
+            return await generator.next_message(msg_type)
+
+    content = asyncio.run(generate())
+    if content:
+        save_message(content)
+    return content
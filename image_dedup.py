@@ -0,0 +1,79 @@
+"""Perceptual hashing and near-duplicate lookup for images
+
+Images are fingerprinted with a 64-bit difference hash (dHash): the image
+is shrunk to 9x8 grayscale pixels and every bit records whether a pixel is
+brighter than its right-hand neighbour. Resized, recompressed or slightly
+edited copies of an image get hashes that differ in only a few bits, so the
+Hamming distance between two hashes measures how alike the images look.
+
+A BK-tree indexes hashes by Hamming distance, so finding every hash within
+a few bits of a new one only visits a small part of the tree.
+"""
+
+from typing import Any, List, Optional, Tuple
+
+HASH_SIZE = 8
+
+
+def dhash(image_path: str) -> Optional[int]:
+    """Get the 64-bit difference hash of an image, or None if it can't be read (or Pillow is missing)"""
+    try:
+        from PIL import Image
+        with Image.open(image_path) as image:
+            pixels = list(image.convert("L").resize((HASH_SIZE + 1, HASH_SIZE), Image.LANCZOS).getdata())
+    except Exception:
+        return None
+
+    value = 0
+    for row in range(HASH_SIZE):
+        for column in range(HASH_SIZE):
+            left = pixels[row * (HASH_SIZE + 1) + column]
+            right = pixels[row * (HASH_SIZE + 1) + column + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+def hamming_distance(first: int, second: int) -> int:
+    return bin(first ^ second).count("1")
+
+
+class BKTree:
+    """Burkhard-Keller tree of hashes under the Hamming distance"""
+
+    def __init__(self):
+        # Node: [hash, item, {distance: child node}]
+        self._root = None
+        self.size = 0
+
+    def add(self, value: int, item: Any = None):
+        self.size += 1
+        if self._root is None:
+            self._root = [value, item, {}]
+            return
+
+        node = self._root
+        while True:
+            distance = hamming_distance(value, node[0])
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, item, {}]
+                return
+            node = child
+
+    def search(self, value: int, max_distance: int) -> List[Tuple[int, Any]]:
+        """Get (distance, item) for every hash within max_distance of value, closest first"""
+        if self._root is None:
+            return []
+
+        matches = []
+        candidates = [self._root]
+        while candidates:
+            node = candidates.pop()
+            distance = hamming_distance(value, node[0])
+            if distance <= max_distance:
+                matches.append((distance, node[1]))
+            # Triangle inequality: only subtrees in this distance band can hold matches
+            for child_distance, child in node[2].items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    candidates.append(child)
+        return sorted(matches, key=lambda match: match[0])
@@ -0,0 +1,336 @@
+"""Indexed pool of images to post
+
+The images folder is indexed in a SQLite database together with each
+image's size, dimensions, SHA-256, how often it was posted and when it was
+last posted. The folder is only rescanned when its mtime changes, and only
+new or modified files are read, so picking an image stays instant with tens
+of thousands of images.
+
+Images are picked with weighted random selection that favours images which
+have not been posted for a long time (or never), using an alias table for
+O(1) draws. Candidates that look like an image posted in the last
+IMAGE_DEDUP_DAYS days (by perceptual hash, see image_dedup) are rejected.
+"""
+
+import logging
+import os
+import random
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+from config import Config
+from image_dedup import BKTree, dhash, hamming_distance
+from utils import file_sha256, open_sqlite
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'}
+
+# Draws before select() gives up on finding an image that isn't a near-duplicate of a recent post
+SELECT_ATTEMPTS = 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    path TEXT PRIMARY KEY,
+    folder TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    width INTEGER,
+    height INTEGER,
+    sha256 TEXT,
+    phash TEXT,
+    times_used INTEGER NOT NULL DEFAULT 0,
+    last_posted_at REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_images_folder ON images (folder);
+
+CREATE TABLE IF NOT EXISTS pool_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class AliasTable:
+    """Vose alias table: built in O(n), then every weighted draw is O(1)"""
+
+    def __init__(self, weights: List[float]):
+        count = len(weights)
+        total = sum(weights)
+        scaled = [weight * count / total for weight in weights]
+        self.probability = [1.0] * count
+        self.alias = list(range(count))
+
+        small = [index for index, value in enumerate(scaled) if value < 1]
+        large = [index for index, value in enumerate(scaled) if value >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] += scaled[less] - 1
+            (small if scaled[more] < 1 else large).append(more)
+
+    def draw(self) -> int:
+        index = random.randrange(len(self.probability))
+        return index if random.random() < self.probability[index] else self.alias[index]
+
+
+def _image_dimensions(path: str) -> Tuple[Optional[int], Optional[int]]:
+    """Read an image's width and height (header only), if Pillow is available"""
+    try:
+        from PIL import Image
+        with Image.open(path) as image:
+            return image.width, image.height
+    except Exception:
+        return None, None
+
+
+def _pillow_available() -> bool:
+    try:
+        import PIL  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _manifest_hashes() -> Dict[str, Dict]:
+    """SHA-256s already computed by the APOD backfill, keyed by path"""
+    try:
+        from apod_backfill import read_manifest
+        return {entry["path"]: entry for entry in read_manifest().values()}
+    except Exception:
+        return {}
+
+
+class ImagePool:
+    """SQLite-backed index of the images folder with least-recently-posted weighted selection"""
+
+    def __init__(self, images_dir: str = 'images', db_path: str = None):
+        self.images_dir = images_dir
+        self.folder = os.path.abspath(images_dir)
+        self.db_path = db_path or Config.IMAGE_POOL_PATH
+        # Async callers use the pool from worker threads (one call at a time, see simple_poster)
+        self.conn = open_sqlite(self.db_path, SCHEMA, check_same_thread=False)
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(images)")}
+        if "phash" not in columns:
+            # Index created before perceptual hashes; the next refresh hashes every image once
+            self.conn.execute("ALTER TABLE images ADD COLUMN phash TEXT")
+            self.conn.execute("DELETE FROM pool_state")
+        self.conn.commit()
+
+        self._paths: List[str] = []
+        self._alias_table: Optional[AliasTable] = None
+        self._recent_posts: Optional[BKTree] = None
+        self._can_hash = _pillow_available()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _state(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM pool_state WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def refresh(self, force: bool = False) -> int:
+        """Bring the index up to date with the images folder, returning how many entries changed
+
+        Skipped when the folder's mtime is unchanged (files were neither added, removed nor
+        renamed), unless `force` is set.
+        """
+        if not os.path.isdir(self.images_dir):
+            return 0
+
+        folder_mtime = str(os.stat(self.images_dir).st_mtime)
+        state_key = f"mtime:{self.folder}"
+        if not force and self._state(state_key) == folder_mtime:
+            return 0
+
+        indexed = {}
+        unhashed = set()
+        for row in self.conn.execute("SELECT path, size, mtime, phash FROM images WHERE folder = ?", (self.folder,)):
+            indexed[row["path"]] = (row["size"], row["mtime"])
+            if row["phash"] is None:
+                unhashed.add(row["path"])
+
+        found = {}
+        with os.scandir(self.images_dir) as entries:
+            for entry in entries:
+                extension = os.path.splitext(entry.name)[1].lower()
+                if entry.is_file() and not entry.name.startswith('.') and extension in IMAGE_EXTENSIONS:
+                    stat = entry.stat()
+                    found[os.path.join(self.images_dir, entry.name)] = (stat.st_size, stat.st_mtime)
+
+        changed = [
+            path for path, signature in found.items()
+            if indexed.get(path) != signature or (self._can_hash and path in unhashed)
+        ]
+        removed = [path for path in indexed if path not in found]
+
+        known_hashes = _manifest_hashes() if changed else {}
+        with self.conn:
+            for path in changed:
+                size, mtime = found[path]
+                manifest_entry = known_hashes.get(path)
+                if manifest_entry and manifest_entry.get("size") == size:
+                    sha256 = manifest_entry["sha256"]
+                else:
+                    sha256 = file_sha256(path)
+                width, height = _image_dimensions(path)
+                # "" marks images that can't be hashed, NULL ones that haven't been yet (no Pillow)
+                phash = None
+                if self._can_hash:
+                    value = dhash(path)
+                    phash = f"{value:016x}" if value is not None else ""
+                # Keep the usage history of images that were modified in place
+                self.conn.execute(
+                    """INSERT INTO images (path, folder, size, mtime, width, height, sha256, phash)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                       ON CONFLICT(path) DO UPDATE SET size = excluded.size, mtime = excluded.mtime,
+                       width = excluded.width, height = excluded.height, sha256 = excluded.sha256,
+                       phash = excluded.phash""",
+                    (path, self.folder, size, mtime, width, height, sha256, phash)
+                )
+            self.conn.executemany("DELETE FROM images WHERE path = ?", [(path,) for path in removed])
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pool_state (key, value) VALUES (?, ?)", (state_key, folder_mtime)
+            )
+
+        if changed or removed:
+            self._alias_table = None
+        return len(changed) + len(removed)
+
+    def _weight(self, last_posted_at: Optional[float], now: float) -> float:
+        """Weight grows with the days since the image was last posted, up to IMAGE_POOL_LRU_DAYS"""
+        if last_posted_at is None:
+            return Config.IMAGE_POOL_LRU_DAYS + 1
+        return min((now - last_posted_at) / 86400, Config.IMAGE_POOL_LRU_DAYS) + 1
+
+    def _build_alias_table(self):
+        now = time.time()
+        rows = self.conn.execute(
+            "SELECT path, last_posted_at FROM images WHERE folder = ?", (self.folder,)
+        ).fetchall()
+        self._paths = [row["path"] for row in rows]
+        self._alias_table = AliasTable([self._weight(row["last_posted_at"], now) for row in rows]) if rows else None
+
+    def _recent_posts_tree(self) -> BKTree:
+        """BK-tree of the perceptual hashes of images posted in the last IMAGE_DEDUP_DAYS days"""
+        if self._recent_posts is None:
+            self._recent_posts = BKTree()
+            posted_since = time.time() - Config.IMAGE_DEDUP_DAYS * 86400
+            for row in self.conn.execute(
+                "SELECT path, phash FROM images WHERE last_posted_at >= ? AND phash != ''", (posted_since,)
+            ):
+                self._recent_posts.add(int(row["phash"], 16), row["path"])
+        return self._recent_posts
+
+    def recent_duplicate(self, path: str) -> Optional[str]:
+        """Get a recently posted image that looks like this one (within IMAGE_DEDUP_DISTANCE bits), if any"""
+        if Config.IMAGE_DEDUP_DAYS <= 0:
+            return None
+        row = self.get(path)
+        if not row or not row["phash"]:
+            return None
+
+        matches = self._recent_posts_tree().search(int(row["phash"], 16), Config.IMAGE_DEDUP_DISTANCE)
+        return matches[0][1] if matches else None
+
+    def select(self) -> Optional[str]:
+        """Pick an image, favouring images that haven't been posted for a while
+
+        Returns None if the pool is empty or every candidate drawn was a near-duplicate of a recent post.
+        """
+        self.refresh()
+        for _ in range(SELECT_ATTEMPTS):
+            if self._alias_table is None:
+                self._build_alias_table()
+                if self._alias_table is None:
+                    return None
+
+            path = self._paths[self._alias_table.draw()]
+            if not os.path.exists(path):
+                # The file disappeared without the folder mtime changing (e.g. an NFS mount)
+                self.refresh(force=True)
+                self._alias_table = None
+                continue
+
+            duplicate_of = self.recent_duplicate(path)
+            if duplicate_of is None:
+                return path
+            logger.info(f"Skipping {path}: looks like {duplicate_of}, posted in the last {Config.IMAGE_DEDUP_DAYS} days")
+
+        logger.warning(f"No image found that isn't a near-duplicate of a recent post after {SELECT_ATTEMPTS} draws")
+        return None
+
+    def select_many(self, count: int) -> List[str]:
+        """Pick up to `count` different images (see select) that don't look like each other either"""
+        selected = []
+        selected_hashes = []
+        for _ in range(count * 3):
+            if len(selected) >= count:
+                break
+            path = self.select()
+            if path is None:
+                break
+            if path in selected:
+                continue
+
+            row = self.get(path)
+            phash = int(row["phash"], 16) if row and row["phash"] else None
+            if phash is not None and any(
+                hamming_distance(phash, other) <= Config.IMAGE_DEDUP_DISTANCE for other in selected_hashes
+            ):
+                logger.info(f"Skipping {path}: looks like an image already picked")
+                continue
+            selected.append(path)
+            if phash is not None:
+                selected_hashes.append(phash)
+        return selected
+
+    def mark_posted(self, path: str):
+        """Record that an image was posted, lowering its chance of being picked again soon"""
+        with self.conn:
+            self.conn.execute(
+                "UPDATE images SET times_used = times_used + 1, last_posted_at = ? WHERE path = ?",
+                (time.time(), path)
+            )
+        self._alias_table = None
+
+        row = self.get(path)
+        if self._recent_posts is not None and row and row["phash"]:
+            self._recent_posts.add(int(row["phash"], 16), path)
+
+    def find_duplicates(self, max_distance: int = None) -> List[Tuple[str, str, int]]:
+        """Find pairs of near-duplicate images in the pool as (path, duplicate path, distance)"""
+        if max_distance is None:
+            max_distance = Config.IMAGE_DEDUP_DISTANCE
+        self.refresh()
+
+        tree = BKTree()
+        duplicates = []
+        for row in self.conn.execute(
+            "SELECT path, phash FROM images WHERE folder = ? AND phash != '' ORDER BY path", (self.folder,)
+        ):
+            value = int(row["phash"], 16)
+            for distance, other_path in tree.search(value, max_distance):
+                duplicates.append((other_path, row["path"], distance))
+            tree.add(value, row["path"])
+        return duplicates
+
+    def get(self, path: str) -> Optional[sqlite3.Row]:
+        """Get the indexed metadata of an image"""
+        return self.conn.execute("SELECT * FROM images WHERE path = ?", (path,)).fetchone()
+
+    def stats(self) -> Dict[str, int]:
+        row = self.conn.execute(
+            """SELECT COUNT(*) AS images, SUM(times_used = 0) AS never_posted, SUM(size) AS total_bytes
+               FROM images WHERE folder = ?""",
+            (self.folder,)
+        ).fetchone()
+        return {"images": row["images"], "never_posted": row["never_posted"] or 0, "total_bytes": row["total_bytes"] or 0}
@@ -0,0 +1,137 @@
+"""Platform-specific image variants
+
+Each platform has its own upload limits. When an image is too large for a
+platform it is downscaled and/or recompressed into a variant that fits, and
+the variant is stored in a content-addressed cache (source SHA-256 + platform +
+a hash of the profile's limits), so every source image is transcoded at most
+once per platform profile, and changing a profile's limits makes new variants.
+
+Transcoding needs Pillow. Without it images are posted unchanged.
+"""
+
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import threading
+from typing import Dict, Optional
+from config import Config
+from utils import file_sha256
+
+logger = logging.getLogger(__name__)
+
+PLATFORM_IMAGE_PROFILES: Dict[str, Dict] = {
+    # Discord rejects attachments over 8MB on servers without boosts
+    "Discord": {"max_bytes": 8 * 1024 * 1024},
+    # Telegram photos: up to 10MB, width + height at most 10000
+    "Telegram": {"max_bytes": 10 * 1024 * 1024, "max_dimension_sum": 10000},
+    # X image uploads: up to 5MB
+    "X": {"max_bytes": 5 * 1024 * 1024},
+    # Facebook photos: recommended maximum of 4MB
+    "Facebook": {"max_bytes": 4 * 1024 * 1024},
+}
+
+# Quality steps tried before the image is downscaled further
+JPEG_QUALITIES = (90, 82, 75, 68)
+DOWNSCALE_STEP = 0.8
+
+# One lock per variant file, so concurrent rounds don't transcode the same variant twice
+_variant_locks: Dict[str, threading.Lock] = {}
+_variant_locks_guard = threading.Lock()
+
+
+def _variant_lock(variant_path: str) -> threading.Lock:
+    with _variant_locks_guard:
+        return _variant_locks.setdefault(variant_path, threading.Lock())
+
+
+def _fits_dimensions(width: int, height: int, profile: Dict) -> bool:
+    max_dimension_sum = profile.get("max_dimension_sum")
+    return not max_dimension_sum or width + height <= max_dimension_sum
+
+
+def _profile_hash(profile: Dict) -> str:
+    """Short hash of a profile's limits, part of its variants' cache key"""
+    return hashlib.sha256(json.dumps(profile, sort_keys=True).encode('utf-8')).hexdigest()[:8]
+
+
+def _transcode(image_path: str, variant_path: str, profile: Dict):
+    """Write a JPEG variant of the image that fits the profile"""
+    from PIL import Image
+
+    with Image.open(image_path) as source:
+        if source.mode in ("RGBA", "LA", "PA") or (source.mode == "P" and "transparency" in source.info):
+            # JPEG has no alpha: put transparent areas on white instead of letting them turn black
+            rgba = source.convert("RGBA")
+            image = Image.new("RGB", rgba.size, (255, 255, 255))
+            image.paste(rgba, mask=rgba.getchannel("A"))
+        else:
+            image = source.convert("RGB")
+
+    # Scale down first if the dimensions themselves are over the limit
+    max_dimension_sum = profile.get("max_dimension_sum")
+    if max_dimension_sum and image.width + image.height > max_dimension_sum:
+        scale = max_dimension_sum / (image.width + image.height)
+        image = image.resize((int(image.width * scale), int(image.height * scale)), Image.LANCZOS)
+
+    temp_path = f"{variant_path}.tmp"
+    while True:
+        for quality in JPEG_QUALITIES:
+            image.save(temp_path, "JPEG", quality=quality, optimize=True, progressive=True)
+            if os.path.getsize(temp_path) <= profile["max_bytes"]:
+                os.replace(temp_path, variant_path)
+                return
+
+        if min(image.width, image.height) < 64:
+            os.remove(temp_path)
+            raise ValueError(f"Could not fit {image_path} into {profile['max_bytes']} bytes")
+        image = image.resize(
+            (int(image.width * DOWNSCALE_STEP), int(image.height * DOWNSCALE_STEP)),
+            Image.LANCZOS
+        )
+
+
+def get_image_variant(image_path: str, platform: str, source_digest: Optional[str] = None) -> str:
+    """Get the path of an image that fits the platform's limits
+
+    Returns image_path itself when it already fits (or the platform has no profile),
+    otherwise the path of a cached variant, creating it if needed.
+    """
+    profile = PLATFORM_IMAGE_PROFILES.get(platform)
+    if not profile:
+        return image_path
+
+    # Only still images are transcoded; videos and animated GIFs are posted as they are
+    content_type, _ = mimetypes.guess_type(image_path)
+    if not content_type or not content_type.startswith("image/") or content_type == "image/gif":
+        return image_path
+
+    within_size = os.path.getsize(image_path) <= profile["max_bytes"]
+    if within_size and "max_dimension_sum" not in profile:
+        return image_path
+
+    try:
+        from PIL import Image
+    except ImportError:
+        logger.warning(f"Pillow is not installed, posting {image_path} to {platform} without resizing")
+        return image_path
+
+    if within_size:
+        with Image.open(image_path) as image:
+            if _fits_dimensions(image.width, image.height, profile):
+                return image_path
+
+    source_digest = source_digest or file_sha256(image_path)
+    os.makedirs(Config.IMAGE_VARIANTS_DIR, exist_ok=True)
+    variant_path = os.path.join(
+        Config.IMAGE_VARIANTS_DIR, f"{source_digest}_{platform.lower()}_{_profile_hash(profile)}.jpg"
+    )
+
+    with _variant_lock(variant_path):
+        if not os.path.exists(variant_path):
+            logger.info(f"Creating {platform} variant of {image_path}")
+            _transcode(image_path, variant_path, profile)
+            logger.info(f"{platform} variant: {os.path.getsize(image_path)} -> {os.path.getsize(variant_path)} bytes")
+
+    return variant_path
@@ -0,0 +1,108 @@
+"""Shared, memory-mapped image buffers for uploads
+
+A posting round maps the image file once and hands the same SharedImage to
+every platform. Uploads read from the mapping instead of opening and reading
+the file again per platform, and the mapped pages live in the OS page cache
+rather than in a private copy per upload.
+"""
+
+import hashlib
+import io
+import mimetypes
+import mmap
+import os
+from contextlib import contextmanager
+
+
+class _MappedReader(io.RawIOBase):
+    """Independent read position over a shared memory map"""
+
+    def __init__(self, view: memoryview, name: str):
+        super().__init__()
+        self._view = view
+        self._position = 0
+        self.name = name
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        chunk = self._view[self._position:self._position + len(buffer)]
+        buffer[:len(chunk)] = chunk
+        self._position += len(chunk)
+        return len(chunk)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            self._position = offset
+        elif whence == io.SEEK_CUR:
+            self._position += offset
+        else:
+            self._position = len(self._view) + offset
+        return self._position
+
+    def tell(self):
+        return self._position
+
+
+class SharedImage:
+    """Read-only image file mapped into memory once and shared by all uploads of a round"""
+
+    def __init__(self, path: str):
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Image file not found: {path}")
+
+        self.path = path
+        self.filename = os.path.basename(path)
+        content_type, _ = mimetypes.guess_type(path)
+        self.content_type = content_type or 'image/jpeg'  # Default fallback
+
+        self._file = open(path, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        if self.size == 0:
+            self._file.close()
+            raise ValueError(f"Image file is empty: {path}")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._digest = None
+
+    def view(self) -> memoryview:
+        """Zero-copy view of the whole file"""
+        return memoryview(self._mmap)
+
+    def open(self) -> io.BufferedReader:
+        """File-like reader with its own position, safe to use alongside other readers"""
+        return io.BufferedReader(_MappedReader(self.view(), self.filename))
+
+    def sha256(self) -> str:
+        """SHA-256 hex digest of the image, computed once"""
+        if self._digest is None:
+            self._digest = hashlib.sha256(self._mmap).hexdigest()
+        return self._digest
+
+    def close(self):
+        try:
+            self._mmap.close()
+        except BufferError:
+            # A view is still held by an unfinished upload, the mapping goes away with it
+            pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+@contextmanager
+def use_image(image_path: str = None, image: SharedImage = None):
+    """Yield the shared image if one was given, otherwise map image_path for this upload only"""
+    if image is not None or not image_path:
+        yield image
+        return
+
+    with SharedImage(image_path) as own_image:
+        yield own_image
@@ -0,0 +1,203 @@
+"""Posting metrics: latency histograms, upload volume, retries and rate limit waits
+
+SocialMediaPoster records every post here. The metrics can be written to
+METRICS_FILE either as Prometheus text (the file is rewritten with the
+current totals, e.g. for the node_exporter textfile collector) or as JSON
+lines (one line per post appended to the file).
+"""
+
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Sequence
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in seconds
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+class Histogram:
+    """Cumulative latency histogram in the Prometheus layout"""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        for index, upper_bound in enumerate(self.buckets):
+            if value <= upper_bound:
+                self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+
+class PlatformMetrics:
+    """Counters for one platform channel"""
+
+    def __init__(self):
+        self.posts = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.duplicates = 0
+        self.attempts = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.rate_limit_wait = 0.0
+        self.bytes_uploaded = 0
+        self.request_latency = Histogram()  # One observation per request sent to the platform
+        self.post_latency = Histogram()  # Whole post including rate limit waits and retries
+
+    @property
+    def success_ratio(self) -> float:
+        return self.succeeded / self.posts if self.posts else 0.0
+
+
+class PostingMetrics:
+    """Collects per-platform posting metrics and exports them to METRICS_FILE"""
+
+    def __init__(self, path: str = None, export_format: str = None):
+        self.path = path if path is not None else Config.METRICS_FILE
+        self.export_format = (export_format or Config.METRICS_FORMAT).lower()
+        if self.export_format not in ("prometheus", "jsonl"):
+            raise ValueError(f"Unknown metrics format: {self.export_format}")
+        self.platforms: Dict[str, PlatformMetrics] = {}
+
+    def _platform(self, platform_name: str) -> PlatformMetrics:
+        if platform_name not in self.platforms:
+            self.platforms[platform_name] = PlatformMetrics()
+        return self.platforms[platform_name]
+
+    def observe_request(self, platform_name: str, latency: float, bytes_uploaded: int, rate_limited: bool = False):
+        """Record one request to a platform"""
+        metrics = self._platform(platform_name)
+        metrics.attempts += 1
+        metrics.bytes_uploaded += bytes_uploaded
+        metrics.request_latency.observe(latency)
+        if rate_limited:
+            metrics.rate_limited += 1
+
+    def observe_rate_limit_wait(self, platform_name: str, seconds: float):
+        """Record time spent waiting for a platform's rate limit (pacing or retry backoff)"""
+        if seconds > 0:
+            self._platform(platform_name).rate_limit_wait += seconds
+
+    def observe_post(self, platform_name: str, result: Dict, latency: float):
+        """Record the outcome of a post, once per post and platform"""
+        metrics = self._platform(platform_name)
+        metrics.posts += 1
+        if result.get("duplicate"):
+            metrics.duplicates += 1
+        if result["success"]:
+            metrics.succeeded += 1
+        else:
+            metrics.failed += 1
+        metrics.retries += max(0, result.get("attempts", 1) - 1)
+        if not result.get("duplicate"):
+            metrics.post_latency.observe(latency)
+
+        if self.path and self.export_format == "jsonl":
+            self._append_jsonl({
+                "timestamp": time.time(),
+                "platform": platform_name,
+                "success": result["success"],
+                "duplicate": bool(result.get("duplicate")),
+                "latency": round(latency, 4),
+                "attempts": result.get("attempts", 0),
+                "error": result.get("error")
+            })
+
+    def summary(self) -> List[Dict]:
+        """Per-platform totals, slowest platform (by total posting time) first"""
+        rows = []
+        for platform_name, metrics in self.platforms.items():
+            rows.append({
+                "platform": platform_name,
+                "posts": metrics.posts,
+                "success_ratio": metrics.success_ratio,
+                "total_seconds": metrics.post_latency.sum,
+                "avg_seconds": metrics.post_latency.sum / metrics.post_latency.count if metrics.post_latency.count else 0.0,
+                "max_seconds": metrics.post_latency.max,
+                "retries": metrics.retries,
+                "rate_limit_wait": metrics.rate_limit_wait,
+                "bytes_uploaded": metrics.bytes_uploaded
+            })
+        return sorted(rows, key=lambda row: row["total_seconds"], reverse=True)
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = []
+
+        def metric(name: str, help_text: str, values: Dict[str, float], metric_type: str = "counter"):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value in values.items():
+                lines.append(f"{name}{{{labels}}} {value}")
+
+        def histogram(name: str, help_text: str, attribute: str):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for platform_name, metrics in self.platforms.items():
+                values = getattr(metrics, attribute)
+                for upper_bound, count in zip(values.buckets, values.counts):
+                    lines.append(f'{name}_bucket{{platform="{platform_name}",le="{upper_bound}"}} {count}')
+                lines.append(f'{name}_bucket{{platform="{platform_name}",le="+Inf"}} {values.count}')
+                lines.append(f'{name}_sum{{platform="{platform_name}"}} {values.sum}')
+                lines.append(f'{name}_count{{platform="{platform_name}"}} {values.count}')
+
+        posts = {}
+        for platform_name, metrics in self.platforms.items():
+            posts[f'platform="{platform_name}",status="success"'] = metrics.succeeded - metrics.duplicates
+            posts[f'platform="{platform_name}",status="duplicate"'] = metrics.duplicates
+            posts[f'platform="{platform_name}",status="failure"'] = metrics.failed
+
+        def per_platform(attribute: str) -> Dict[str, float]:
+            return {
+                f'platform="{platform_name}"': getattr(metrics, attribute)
+                for platform_name, metrics in self.platforms.items()
+            }
+
+        metric("smm_posts_total", "Posts by outcome", posts)
+        metric("smm_post_success_ratio", "Share of posts that succeeded", per_platform("success_ratio"), "gauge")
+        metric("smm_requests_total", "Requests sent to the platform", per_platform("attempts"))
+        metric("smm_retries_total", "Retried requests", per_platform("retries"))
+        metric("smm_rate_limited_total", "Requests rejected by the platform rate limit", per_platform("rate_limited"))
+        metric("smm_rate_limit_wait_seconds_total", "Time spent waiting for rate limits", per_platform("rate_limit_wait"))
+        metric("smm_upload_bytes_total", "Message and media bytes sent", per_platform("bytes_uploaded"))
+        histogram("smm_request_duration_seconds", "Latency of single platform requests", "request_latency")
+        histogram("smm_post_duration_seconds", "Time to post, including rate limit waits and retries", "post_latency")
+        return "\n".join(lines) + "\n"
+
+    def _append_jsonl(self, record: Dict):
+        try:
+            self._ensure_directory()
+            with open(self.path, 'a', encoding='utf-8') as metrics_file:
+                metrics_file.write(json.dumps(record) + "\n")
+        except OSError as e:
+            logger.warning(f"Could not write metrics to {self.path}: {str(e)}")
+
+    def _ensure_directory(self):
+        metrics_dir = os.path.dirname(self.path)
+        if metrics_dir:
+            os.makedirs(metrics_dir, exist_ok=True)
+
+    def export(self):
+        """Write the current totals to METRICS_FILE (Prometheus format only; JSON lines are written per post)"""
+        if not self.path or self.export_format != "prometheus":
+            return
+
+        temp_path = f"{self.path}.tmp"
+        try:
+            self._ensure_directory()
+            with open(temp_path, 'w', encoding='utf-8') as metrics_file:
+                metrics_file.write(self.to_prometheus())
+            # Replace atomically so a scraper never reads a half-written file
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write metrics to {self.path}: {str(e)}")
@@ -1,30 +1,189 @@
 import requests
 import json
 import os
-from datetime import datetime
-from typing import Dict, Optional, Tuple
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from config import Config
+from utils import open_sqlite
+
+APOD_DATE_FORMAT = '%Y-%m-%d'
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+DOWNLOADS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS downloads (
+    path TEXT PRIMARY KEY,
+    url TEXT,
+    etag TEXT,
+    size INTEGER
+);
+"""
+
+CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS apod (
+    date TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    fetched_at TEXT NOT NULL
+);
+"""
+
+
+def image_filename(image_url: str) -> str:
+    """Get the local file name for an image URL"""
+    return image_url.split('/')[-1].split('?')[0]
+
+
+def _date_range(start_date: str, end_date: str) -> List[str]:
+    """Get every date from start_date to end_date (inclusive) as YYYY-MM-DD strings"""
+    current = datetime.strptime(start_date, APOD_DATE_FORMAT)
+    end = datetime.strptime(end_date, APOD_DATE_FORMAT)
+    dates = []
+    while current <= end:
+        dates.append(current.strftime(APOD_DATE_FORMAT))
+        current += timedelta(days=1)
+    return dates
+
+
+class APODCache:
+    """Date-keyed SQLite cache of APOD API entries
+    
+    An APOD entry never changes once published, so entries are kept indefinitely.
+    """
+    
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or Config.APOD_CACHE_PATH
+        self.conn = open_sqlite(self.db_path, CACHE_SCHEMA)
+    
+    def get(self, date: str) -> Optional[Dict]:
+        row = self.conn.execute("SELECT data FROM apod WHERE date = ?", (date,)).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def get_range(self, start_date: str, end_date: str) -> Dict[str, Dict]:
+        """Get the cached entries between two dates (inclusive), keyed by date"""
+        rows = self.conn.execute(
+            "SELECT date, data FROM apod WHERE date BETWEEN ? AND ? ORDER BY date",
+            (start_date, end_date)
+        )
+        return {date: json.loads(data) for date, data in rows}
+    
+    def store(self, entries: List[Dict]):
+        fetched_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO apod (date, data, fetched_at) VALUES (?, ?, ?)",
+                [(entry['date'], json.dumps(entry), fetched_at) for entry in entries if entry.get('date')]
+            )
+    
+    def close(self):
+        self.conn.close()
+
+
+class DownloadState:
+    """ETag, URL and expected size of downloaded and partially downloaded images, keyed by file path
+    
+    Kept in a SQLite database (APOD_DOWNLOADS_PATH) and shared by NASAAPOD.download_image and the archive backfill,
+    so either can resume a download the other (or an earlier run) was interrupted in.
+    """
+    
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or Config.APOD_DOWNLOADS_PATH
+        # The backfill uses the state from worker threads; the lock keeps them to one query at a time
+        self.conn = open_sqlite(self.db_path, DOWNLOADS_SCHEMA, check_same_thread=False)
+        self._lock = threading.Lock()
+    
+    def get(self, filepath: str) -> Dict:
+        with self._lock:
+            row = self.conn.execute("SELECT url, etag, size FROM downloads WHERE path = ?", (filepath,)).fetchone()
+        return {'url': row[0], 'etag': row[1], 'size': row[2]} if row else {}
+    
+    def save(self, filepath: str, entry: Dict):
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO downloads (path, url, etag, size) VALUES (?, ?, ?, ?)",
+                (filepath, entry.get('url'), entry.get('etag'), entry.get('size'))
+            )
+    
+    def close(self):
+        self.conn.close()
+    
+    def request_headers(self, filepath: str, image_url: str) -> Dict[str, str]:
+        """Get the headers that revalidate a downloaded image or resume a partial download"""
+        state = self.get(filepath)
+        temp_path = f"{filepath}.part"
+        headers = {}
+        if os.path.exists(filepath) and state.get('etag'):
+            headers['If-None-Match'] = state['etag']
+        elif os.path.exists(temp_path) and os.path.getsize(temp_path) and state.get('url') == image_url \
+                and state.get('etag'):
+            # If-Range makes the server send the whole image instead if it changed since
+            headers['Range'] = f"bytes={os.path.getsize(temp_path)}-"
+            headers['If-Range'] = state['etag']
+        return headers
+    
+    def plan(self, filepath: str, image_url: str, status: int, etag: Optional[str],
+             content_length: Optional[int]) -> Tuple[Optional[str], Optional[int]]:
+        """Decide how to handle the response to request_headers
+        
+        Returns the mode to open the .part file with ('ab' to resume, 'wb' to start over) and the
+        expected size of the complete image, or a None mode if the image is already downloaded.
+        The validator is saved before any data is written, so an interrupted download can resume.
+        """
+        state = self.get(filepath)
+        existing_size = os.path.getsize(filepath) if os.path.exists(filepath) else None
+        temp_path = f"{filepath}.part"
+        
+        if status == 304:
+            return None, existing_size
+        if status == 206:
+            resume_from = os.path.getsize(temp_path)
+            return 'ab', resume_from + content_length if content_length is not None else None
+        
+        same_file = not etag or not state.get('etag') or etag == state['etag']
+        if existing_size is not None and content_length == existing_size and same_file:
+            self.save(filepath, {'url': image_url, 'etag': etag, 'size': existing_size})
+            return None, existing_size
+        
+        self.save(filepath, {'url': image_url, 'etag': etag, 'size': content_length})
+        return 'wb', content_length
+    
+    def finish(self, filepath: str, total_size: Optional[int]):
+        """Check a download's .part file is complete and move it into place"""
+        temp_path = f"{filepath}.part"
+        downloaded_size = os.path.getsize(temp_path)
+        if total_size is not None and downloaded_size != total_size:
+            raise IOError(f"Incomplete download: {downloaded_size} of {total_size} bytes")
+        os.replace(temp_path, filepath)
+    
+    def discard_unresumable(self, filepath: str):
+        """Delete the .part file of a failed download, unless it can be resumed (the server sent an ETag)"""
+        temp_path = f"{filepath}.part"
+        if os.path.exists(temp_path) and not self.get(filepath).get('etag'):
+            os.remove(temp_path)
 
 
 class NASAAPOD:
     """Handles NASA Astronomy Picture of the Day API requests"""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, use_cache: bool = None, images_dir: str = 'images'):
         self.api_key = api_key
         self.base_url = "https://api.nasa.gov/planetary/apod"
+        self.images_dir = images_dir
+        # One session for the API and image downloads, so connections to NASA are reused
+        self.session = requests.Session()
+        self.download_state = DownloadState()
+        if use_cache is None:
+            use_cache = Config.APOD_CACHE
+        # Every date is only requested from the API once; reruns and range fetches read the cache
+        self.cache = APODCache() if use_cache else None
     
-    def get_apod_data(self) -> Optional[Dict]:
-        """Fetch APOD data from NASA API"""
+    def _request(self, params: Dict):
+        """Call the APOD API, returning the parsed JSON or None on failure"""
         try:
-            params = {
-                'api_key': self.api_key,
-                'date': datetime.now().strftime('%Y-%m-%d')
-            }
-            
-            response = requests.get(self.base_url, params=params, timeout=30)
+            params = dict(params, api_key=self.api_key)
+            response = self.session.get(self.base_url, params=params, timeout=30)
             response.raise_for_status()
             
-            data = response.json()
-            return data
+            return response.json()
             
         except requests.exceptions.RequestException as e:
             print(f"❌ Error fetching APOD data: {str(e)}")
@@ -33,34 +192,99 @@ class NASAAPOD:
             print(f"❌ Error parsing APOD JSON: {str(e)}")
             return None
     
+    def get_apod_data(self, date: str = None) -> Optional[Dict]:
+        """Fetch APOD data for a date (YYYY-MM-DD, default today), from the cache if possible"""
+        date = date or datetime.now().strftime(APOD_DATE_FORMAT)
+        
+        if self.cache:
+            cached = self.cache.get(date)
+            if cached:
+                print(f"📦 Using cached APOD for {date}")
+                return cached
+        
+        data = self._request({'date': date})
+        if data and self.cache:
+            self.cache.store([data])
+        return data
+    
+    def get_apod_range(self, start_date: str, end_date: str = None) -> List[Dict]:
+        """Fetch every APOD from start_date to end_date (inclusive, default today), oldest first
+        
+        Dates that are not cached yet are fetched with a single start_date/end_date API request,
+        so a whole month can be pre-warmed in one call.
+        """
+        end_date = end_date or datetime.now().strftime(APOD_DATE_FORMAT)
+        entries = self.cache.get_range(start_date, end_date) if self.cache else {}
+        
+        missing_dates = [date for date in _date_range(start_date, end_date) if date not in entries]
+        if missing_dates:
+            print(f"🔭 Fetching {len(missing_dates)} APOD entries from {missing_dates[0]} to {missing_dates[-1]}...")
+            data = self._request({'start_date': missing_dates[0], 'end_date': missing_dates[-1]})
+            if isinstance(data, list):
+                if self.cache:
+                    self.cache.store(data)
+                entries.update({entry['date']: entry for entry in data if entry.get('date')})
+        
+        return [entries[date] for date in sorted(entries)]
+    
+    def close(self):
+        self.session.close()
+        self.download_state.close()
+        if self.cache:
+            self.cache.close()
+    
     def download_image(self, image_url: str, filename: str = None) -> Optional[str]:
-        """Download image from URL and save locally"""
+        """Download image from URL and save locally
+        
+        The image is streamed in chunks to a .part file and renamed into place once complete,
+        so images/ never contains a half-written image. An interrupted download is resumed
+        with an HTTP Range request, and a file that is already downloaded (same ETag, or same
+        size when the server sends no ETag) is not downloaded again.
+        """
+        filepath = None
         try:
             if not filename:
                 # Extract filename from URL
-                filename = image_url.split('/')[-1]
-                if '?' in filename:
-                    filename = filename.split('?')[0]
+                filename = image_filename(image_url)
             
             # Create images directory if it doesn't exist
-            os.makedirs('images', exist_ok=True)
-            filepath = os.path.join('images', filename)
+            os.makedirs(self.images_dir, exist_ok=True)
+            filepath = os.path.join(self.images_dir, filename)
+            temp_path = f"{filepath}.part"
             
-            # Download image
-            response = requests.get(image_url, timeout=60)
-            response.raise_for_status()
+            headers = self.download_state.request_headers(filepath, image_url)
+            with self.session.get(image_url, headers=headers, stream=True, timeout=60) as response:
+                if response.status_code != 304:
+                    response.raise_for_status()
+                content_length = response.headers.get('Content-Length')
+                mode, total_size = self.download_state.plan(
+                    filepath, image_url, response.status_code, response.headers.get('ETag'),
+                    int(content_length) if content_length else None
+                )
+                if mode is None:
+                    print(f"✅ Image already downloaded: {filepath}")
+                    return filepath
+                if mode == 'ab':
+                    print(f"⏯️  Resuming download at {os.path.getsize(temp_path)} bytes: {filepath}")
+                
+                with open(temp_path, mode) as f:
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
             
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
+            self.download_state.finish(filepath, total_size)
             
             print(f"✅ Image downloaded: {filepath}")
             return filepath
             
         except requests.exceptions.RequestException as e:
             print(f"❌ Error downloading image: {str(e)}")
+            if filepath:
+                self.download_state.discard_unresumable(filepath)
             return None
         except Exception as e:
             print(f"❌ Error saving image: {str(e)}")
+            if filepath:
+                self.download_state.discard_unresumable(filepath)
             return None
     
     def format_apod_message(self, apod_data: Dict) -> str:
@@ -0,0 +1,281 @@
+"""Durable on-disk outbox for batch posting
+
+Messages are queued in a SQLite database together with an optional image
+and the platforms they should go to. Every (message, platform) pair is a
+delivery with its own status:
+
+    pending   -> waiting to be posted
+    sending   -> a post request is in flight
+    sent      -> posted successfully
+    failed    -> the platform rejected the post (rate-limited posts stay pending)
+    uncertain -> the process stopped while the post was in flight
+
+A delivery is marked "sending" (and committed) before the post request is
+made, so after a crash we know exactly which posts may or may not have gone
+out. Those are never retried automatically, which keeps a resumed drain from
+double-posting; use retry_uncertain() to requeue them after checking.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+from config import Config
+from utils import open_sqlite
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    message TEXT NOT NULL,
+    image_path TEXT,
+    platforms TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL DEFAULT 'pending',
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS outbox_deliveries (
+    item_id INTEGER NOT NULL REFERENCES outbox(id),
+    platform TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    post_id TEXT,
+    error TEXT,
+    updated_at TEXT,
+    PRIMARY KEY (item_id, platform)
+);
+
+CREATE INDEX IF NOT EXISTS idx_outbox_deliveries_status ON outbox_deliveries (status, platform);
+"""
+
+
+def _now() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+class Outbox:
+    """SQLite-backed queue of messages waiting to be posted"""
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or Config.OUTBOX_DB_PATH
+        # WAL keeps readers (e.g. the status command) from blocking a running drain
+        self.conn = open_sqlite(self.db_path, SCHEMA, wal=True)
+
+    def close(self):
+        self.conn.close()
+
+    def enqueue(self, message: str, image_path: str = None, platforms: List[str] = None) -> int:
+        """Queue a message, returning its outbox ID
+
+        Without `platforms` the message goes to every platform configured when the outbox is drained.
+        """
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO outbox (message, image_path, platforms, created_at) VALUES (?, ?, ?, ?)",
+                (message, image_path, ",".join(platforms or []), _now())
+            )
+            item_id = cursor.lastrowid
+            for platform in platforms or []:
+                self.conn.execute(
+                    "INSERT INTO outbox_deliveries (item_id, platform, updated_at) VALUES (?, ?, ?)",
+                    (item_id, platform, _now())
+                )
+        return item_id
+
+    def plan_deliveries(self, platforms: List[str]):
+        """Create deliveries for pending messages that target all configured platforms"""
+        with self.conn:
+            for platform in platforms:
+                self.conn.execute(
+                    """INSERT OR IGNORE INTO outbox_deliveries (item_id, platform, updated_at)
+                       SELECT id, ?, ? FROM outbox WHERE platforms = '' AND status = 'pending'""",
+                    (platform, _now())
+                )
+
+    def recover(self) -> int:
+        """Mark deliveries left in flight by a previous run as uncertain, returning how many"""
+        with self.conn:
+            cursor = self.conn.execute(
+                "UPDATE outbox_deliveries SET status = 'uncertain', updated_at = ? WHERE status = 'sending'",
+                (_now(),)
+            )
+        if cursor.rowcount:
+            logger.warning(f"{cursor.rowcount} deliveries were interrupted by a previous run and marked uncertain")
+        return cursor.rowcount
+
+    def retry_uncertain(self) -> int:
+        """Requeue uncertain deliveries (only after checking they were not posted)"""
+        return self._requeue("uncertain")
+
+    def retry_failed(self) -> int:
+        """Requeue failed deliveries"""
+        return self._requeue("failed")
+
+    def _requeue(self, status: str) -> int:
+        with self.conn:
+            cursor = self.conn.execute(
+                "UPDATE outbox_deliveries SET status = 'pending', updated_at = ? WHERE status = ?",
+                (_now(), status)
+            )
+            self.conn.execute(
+                """UPDATE outbox SET status = 'pending' WHERE id IN
+                   (SELECT item_id FROM outbox_deliveries WHERE status = 'pending')"""
+            )
+        return cursor.rowcount
+
+    def pending_deliveries(self, platform: str) -> List[sqlite3.Row]:
+        """Get pending deliveries for a platform, oldest first"""
+        return self.conn.execute(
+            """SELECT d.item_id, d.platform, o.message, o.image_path
+               FROM outbox_deliveries d JOIN outbox o ON o.id = d.item_id
+               WHERE d.status = 'pending' AND d.platform = ?
+               ORDER BY d.item_id""",
+            (platform,)
+        ).fetchall()
+
+    def pending_platforms(self) -> List[str]:
+        """Get the platforms that have pending deliveries"""
+        rows = self.conn.execute(
+            "SELECT DISTINCT platform FROM outbox_deliveries WHERE status = 'pending'"
+        ).fetchall()
+        return [row["platform"] for row in rows]
+
+    def mark_sending(self, item_id: int, platform: str):
+        with self.conn:
+            self.conn.execute(
+                """UPDATE outbox_deliveries SET status = 'sending', attempts = attempts + 1, updated_at = ?
+                   WHERE item_id = ? AND platform = ?""",
+                (_now(), item_id, platform)
+            )
+
+    def mark_result(self, item_id: int, platform: str, result: Dict):
+        """Record a poster result for a delivery and update the message status
+        
+        A rate-limited delivery goes back to pending, so the next drain posts it.
+        """
+        post_id = result.get("post_id") or result.get("tweet_id")
+        if result["success"]:
+            status = "sent"
+        elif result.get("rate_limited"):
+            status = "pending"
+        else:
+            status = "failed"
+        with self.conn:
+            self.conn.execute(
+                """UPDATE outbox_deliveries SET status = ?, post_id = ?, error = ?, updated_at = ?
+                   WHERE item_id = ? AND platform = ?""",
+                (
+                    status,
+                    str(post_id) if post_id else None,
+                    result.get("error"),
+                    _now(),
+                    item_id,
+                    platform
+                )
+            )
+            self._update_item_status(item_id)
+
+    def _update_item_status(self, item_id: int):
+        statuses = {
+            row["status"] for row in self.conn.execute(
+                "SELECT status FROM outbox_deliveries WHERE item_id = ?", (item_id,)
+            )
+        }
+        if statuses & {"pending", "sending"}:
+            status = "pending"
+        elif statuses == {"sent"}:
+            status = "sent"
+        else:
+            status = "failed"
+        self.conn.execute("UPDATE outbox SET status = ? WHERE id = ?", (status, item_id))
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Count deliveries by platform and status"""
+        stats: Dict[str, Dict[str, int]] = {}
+        for row in self.conn.execute(
+            "SELECT platform, status, COUNT(*) AS total FROM outbox_deliveries GROUP BY platform, status"
+        ):
+            stats.setdefault(row["platform"], {})[row["status"]] = row["total"]
+        return stats
+
+
+async def drain_outbox(outbox: Outbox, poster, platforms: Optional[List[str]] = None) -> Dict[str, float]:
+    """Post every pending delivery through a SocialMediaPoster
+
+    Each platform (channel) is drained by its own OUTBOX_PLATFORM_CONCURRENCY workers,
+    so a slow or rate-limited platform doesn't hold up the others.
+    A platform that is rate limited for longer than RETRY_MAX_DELAY stops draining: its remaining
+    deliveries stay pending for the next drain.
+    Returns drain statistics: sent, failed, deferred, skipped, elapsed seconds and deliveries per second.
+    """
+    outbox.recover()
+    outbox.plan_deliveries(list(poster.platforms.keys()))
+
+    stats = {"sent": 0, "failed": 0, "deferred": 0, "skipped": 0}
+    started_at = time.monotonic()
+
+    async def platform_worker(queue: asyncio.Queue):
+        while True:
+            try:
+                delivery = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            outbox.mark_sending(delivery["item_id"], delivery["platform"])
+            # A delivery is for one channel key, which is matched exactly, so there is one result
+            # Metrics are exported once when the drain finishes, not after every post
+            results = await poster.post_to_all_platforms(
+                delivery["message"],
+                delivery["image_path"],
+                platforms=[delivery["platform"]],
+                export_metrics=False
+            )
+            result = results[0]
+            outbox.mark_result(delivery["item_id"], delivery["platform"], result)
+
+            if result["success"]:
+                stats["sent"] += 1
+            elif result.get("rate_limited"):
+                # Leave the rest of this platform's queue for the next drain
+                deferred = 1
+                while not queue.empty():
+                    queue.get_nowait()
+                    deferred += 1
+                stats["deferred"] += deferred
+                logger.warning(f"{delivery['platform']} is rate limited, {deferred} deliveries left for the next drain")
+            else:
+                stats["failed"] += 1
+                logger.error(f"Outbox item {delivery['item_id']} failed on {delivery['platform']}: {result.get('error')}")
+
+    workers = []
+    for platform in outbox.pending_platforms():
+        if platforms is not None and platform not in platforms:
+            continue
+
+        deliveries = outbox.pending_deliveries(platform)
+        if platform not in poster.platforms:
+            # Leave them queued for a run where the platform is configured
+            logger.warning(f"{len(deliveries)} outbox deliveries for {platform} skipped: platform not configured")
+            stats["skipped"] += len(deliveries)
+            continue
+
+        queue = asyncio.Queue()
+        for delivery in deliveries:
+            queue.put_nowait(delivery)
+        logger.info(f"Draining {len(deliveries)} outbox deliveries for {platform}")
+
+        for _ in range(max(1, Config.OUTBOX_PLATFORM_CONCURRENCY)):
+            workers.append(platform_worker(queue))
+
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        poster.metrics.export()
+
+    elapsed = time.monotonic() - started_at
+    stats["elapsed"] = elapsed
+    stats["per_second"] = (stats["sent"] + stats["failed"]) / elapsed if elapsed > 0 else 0.0
+    return stats
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Outbox Poster
+Queues messages in the on-disk outbox and drains it to all configured social media platforms.
+A drain that is interrupted can simply be started again: posts that already went out are not repeated.
+
+Usage:
+  python outbox_poster.py enqueue "text" [--image path] [--platforms Telegram,X]
+  python outbox_poster.py import-moon-posts [--file db_utils/moon_post.md]
+  python outbox_poster.py drain [--platforms Telegram,X] [--retry-failed] [--retry-uncertain]
+  python outbox_poster.py status
+"""
+
+import argparse
+import asyncio
+import os
+import re
+from typing import List
+from outbox import Outbox, drain_outbox
+from social_media_poster import SocialMediaPoster
+
+
+def parse_platforms(value: str) -> List[str]:
+    """Parse a comma-separated platform list"""
+    if not value:
+        return None
+    return [platform.strip() for platform in value.split(",") if platform.strip()]
+
+
+def read_moon_posts(filename: str) -> List[str]:
+    """Split db_utils/moon_post.md into separate posts (each starts with a **dd-mm-yyyy** line)"""
+    with open(filename, 'r', encoding='utf-8') as posts_file:
+        content = posts_file.read()
+
+    posts = re.split(r'^\*\*\d{2}-\d{2}-\d{4}\*\*\s*$', content, flags=re.MULTILINE)
+    return [post.strip() for post in posts if post.strip()]
+
+
+def show_status(outbox: Outbox):
+    """Print delivery counts per platform"""
+    stats = outbox.stats()
+    if not stats:
+        print("📭 Outbox is empty")
+        return
+
+    print("📊 Outbox Status:")
+    print("-" * 40)
+    for platform, counts in sorted(stats.items()):
+        summary = ", ".join(f"{status}: {total}" for status, total in sorted(counts.items()))
+        print(f"{platform}: {summary}")
+
+
+async def drain(outbox: Outbox, platforms: List[str] = None):
+    """Drain the outbox and report throughput"""
+    async with SocialMediaPoster() as poster:
+        if not poster.platforms:
+            print("❌ No platforms are configured!")
+            print("Please check your .env file and ensure API keys are set.")
+            return
+
+        print(f"✅ Configured platforms: {', '.join(poster.platforms.keys())}")
+        print("🚀 Draining outbox...")
+        stats = await drain_outbox(outbox, poster, platforms)
+
+    print("\n📊 Drain Results:")
+    print("-" * 40)
+    print(f"✅ Sent: {stats['sent']}")
+    print(f"❌ Failed: {stats['failed']}")
+    if stats["deferred"]:
+        print(f"⏳ Rate limited, left for the next drain: {stats['deferred']}")
+    if stats["skipped"]:
+        print(f"⏭️  Skipped (platform not configured): {stats['skipped']}")
+    print(f"⏱️  {stats['elapsed']:.1f}s, {stats['per_second']:.2f} posts/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Queue and batch-post messages through the outbox")
+    parser.add_argument("--db", help="Outbox database path (default: OUTBOX_DB_PATH)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue_parser = commands.add_parser("enqueue", help="Queue a message")
+    enqueue_parser.add_argument("message")
+    enqueue_parser.add_argument("--image", help="Image to post with the message")
+    enqueue_parser.add_argument("--platforms", help="Comma-separated platforms (default: all configured)")
+
+    import_parser = commands.add_parser("import-moon-posts", help="Queue every post from the moon post backlog")
+    import_parser.add_argument("--file", default="db_utils/moon_post.md")
+    import_parser.add_argument("--platforms", help="Comma-separated platforms (default: all configured)")
+
+    drain_parser = commands.add_parser("drain", help="Post everything waiting in the outbox")
+    drain_parser.add_argument("--platforms", help="Only drain these comma-separated platforms")
+    drain_parser.add_argument("--retry-failed", action="store_true", help="Requeue failed deliveries first")
+    drain_parser.add_argument("--retry-uncertain", action="store_true",
+                              help="Requeue deliveries interrupted by a crash (may post them twice)")
+
+    commands.add_parser("status", help="Show delivery counts")
+
+    args = parser.parse_args()
+    outbox = Outbox(args.db)
+
+    try:
+        if args.command == "enqueue":
+            if args.image and not os.path.isfile(args.image):
+                print(f"❌ Image file not found: {args.image}")
+                return
+            item_id = outbox.enqueue(args.message, args.image, parse_platforms(args.platforms))
+            print(f"📥 Queued message #{item_id}")
+
+        elif args.command == "import-moon-posts":
+            if not os.path.exists(args.file):
+                print(f"❌ Error: {args.file} file not found!")
+                return
+            posts = read_moon_posts(args.file)
+            for post in posts:
+                outbox.enqueue(post, platforms=parse_platforms(args.platforms))
+            print(f"📥 Queued {len(posts)} posts from {args.file}")
+
+        elif args.command == "drain":
+            if args.retry_failed:
+                print(f"🔁 Requeued {outbox.retry_failed()} failed deliveries")
+            if args.retry_uncertain:
+                print(f"🔁 Requeued {outbox.retry_uncertain()} uncertain deliveries")
+            asyncio.run(drain(outbox, parse_platforms(args.platforms)))
+            print()
+            show_status(outbox)
+
+        elif args.command == "status":
+            show_status(outbox)
+    finally:
+        outbox.close()
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\n👋 Script interrupted by user. Run the drain again to resume.")
@@ -0,0 +1,55 @@
+"""Local index of what has already been posted where
+
+Every successful post is recorded under a key derived from the message text,
+the image contents and the platform. SocialMediaPoster checks the index before
+sending, so rerunning a script that crashed halfway only posts to the platforms
+that were not reached the first time.
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Dict, Optional
+from config import Config
+from utils import open_sqlite
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    post_key TEXT PRIMARY KEY,
+    platform TEXT NOT NULL,
+    post_id TEXT,
+    posted_at TEXT NOT NULL
+);
+"""
+
+
+def make_post_key(message: str, image_digest: Optional[str], platform: str) -> str:
+    """Build the idempotency key for a post"""
+    key_source = "\0".join([platform, message, image_digest or ""])
+    return hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+
+class PostIndex:
+    """SQLite-backed content-hash index of successful posts"""
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or Config.POST_INDEX_PATH
+        self.conn = open_sqlite(self.db_path, SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def lookup(self, post_key: str) -> Optional[Dict[str, str]]:
+        """Get the recorded post for a key, or None if it was never posted"""
+        row = self.conn.execute(
+            "SELECT platform, post_id, posted_at FROM posts WHERE post_key = ?", (post_key,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def record(self, post_key: str, platform: str, post_id: Optional[str] = None):
+        """Record a successful post"""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO posts (post_key, platform, post_id, posted_at) VALUES (?, ?, ?, ?)",
+                (post_key, platform, str(post_id) if post_id else None,
+                 datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            )
@@ -0,0 +1,108 @@
+"""Poster plugins for each social media platform
+
+Platforms are registered by name together with the import path of their
+poster class and the settings they need. A poster module (and the SDK it
+wraps) is only imported when its platform is enabled and configured, so a
+run that only posts to Telegram never loads tweepy or facebook-sdk.
+
+Extra platforms can be added with register_poster() or packaged as plugins
+through the "smm_agent.posters" entry point group, e.g. in pyproject.toml:
+
+    [project.entry-points."smm_agent.posters"]
+    Mastodon = "smm_mastodon.poster:MastodonPoster"
+
+Plugin posters subclass BasePoster (or SyncPoster for blocking SDKs), take the
+Channel to post to as their only constructor argument, list the settings they
+need in a `required_settings` class attribute and must be enabled in
+ENABLED_PLATFORMS.
+"""
+
+import importlib
+import logging
+from typing import Dict, List, Sequence
+from config import Config
+from posters.base import BasePoster, SyncPoster
+from posters.channels import Channel, load_channels, platform_of
+
+logger = logging.getLogger(__name__)
+
+POSTER_ENTRY_POINT_GROUP = "smm_agent.posters"
+
+
+class PosterSpec:
+    """Registry entry for a platform poster"""
+
+    def __init__(self, name: str, target: str, required_settings: Sequence[str] = None):
+        self.name = name
+        self.target = target  # "module:ClassName"
+        # None means the poster class declares them itself (plugins)
+        self.required_settings = list(required_settings) if required_settings is not None else None
+
+    def load(self):
+        """Import the poster module and return the poster class"""
+        module_name, class_name = self.target.split(":")
+        return getattr(importlib.import_module(module_name), class_name)
+
+
+_registry: Dict[str, PosterSpec] = {}
+_entry_points_loaded = False
+
+
+def register_poster(name: str, target: str, required_settings: Sequence[str] = None):
+    """Register a poster class by its import path, without importing it"""
+    _registry[name] = PosterSpec(name, target, required_settings)
+
+
+def _load_entry_points():
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        return
+
+    discovered = entry_points()
+    if hasattr(discovered, "select"):
+        plugins = discovered.select(group=POSTER_ENTRY_POINT_GROUP)
+    else:
+        plugins = discovered.get(POSTER_ENTRY_POINT_GROUP, [])
+
+    for plugin in plugins:
+        if plugin.name not in _registry:
+            register_poster(plugin.name, plugin.value)
+
+
+def get_poster_spec(name: str) -> PosterSpec:
+    _load_entry_points()
+    if name not in _registry:
+        raise KeyError(f"Unknown platform: {name}")
+    return _registry[name]
+
+
+def required_settings(name: str) -> List[str]:
+    """Get the settings a platform needs, importing plugin posters if necessary"""
+    spec = get_poster_spec(name)
+    if spec.required_settings is not None:
+        return spec.required_settings
+    return list(getattr(spec.load(), "required_settings", []))
+
+
+def missing_settings(name: str, channel: Channel = None) -> List[str]:
+    """Get the settings a platform (or one of its channels) is still missing"""
+    channel = channel or Channel(name)
+    return channel.missing_settings(required_settings(name))
+
+
+def load_poster_class(name: str):
+    """Import and return the poster class for a platform"""
+    return get_poster_spec(name).load()
+
+
+# Built-in platforms
+register_poster("Telegram", "posters.telegram_poster:TelegramPoster", Config.PLATFORM_SETTINGS["Telegram"])
+register_poster("Discord", "posters.discord_poster:DiscordPoster", Config.PLATFORM_SETTINGS["Discord"])
+register_poster("Facebook", "posters.facebook_poster:FacebookPoster", Config.PLATFORM_SETTINGS["Facebook"])
+register_poster("X", "posters.x_poster:XPoster", Config.PLATFORM_SETTINGS["X"])
@@ -0,0 +1,53 @@
+"""Common interface of the platform posters"""
+
+import asyncio
+import functools
+from concurrent.futures import Executor
+from typing import Dict, Optional
+from media import SharedImage
+from posters.channels import Channel
+
+
+class BasePoster:
+    """Async poster interface every platform implements
+
+    post_message returns a result dictionary with at least "success" and
+    "platform"; failures add "error" and, when the platform throttled the
+    post, "rate_limited" and optionally "retry_after" (seconds).
+    """
+
+    platform = ""
+    # Settings the poster needs (Config attributes or environment variables)
+    required_settings = ()
+
+    def __init__(self, channel: Channel = None):
+        # The channel this poster posts to; its settings override the global Config
+        self.channel = channel or Channel(self.platform)
+
+    async def post_message(self, message: str, image_path: str = None, image: SharedImage = None) -> Dict[str, bool]:
+        """Post message with optional image (a path, or a SharedImage prepared by the caller)"""
+        raise NotImplementedError
+
+    async def close(self):
+        """Release network resources held by the poster"""
+
+
+class SyncPoster(BasePoster):
+    """Base for posters wrapping blocking SDKs
+
+    Subclasses implement post_message_sync; post_message runs it in an executor
+    so it never blocks the event loop.
+    """
+
+    # Set by SocialMediaPoster to its bounded thread pool; None uses the loop's default executor
+    executor: Optional[Executor] = None
+
+    def post_message_sync(self, message: str, image_path: str = None, image: SharedImage = None) -> Dict[str, bool]:
+        raise NotImplementedError
+
+    async def post_message(self, message: str, image_path: str = None, image: SharedImage = None) -> Dict[str, bool]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            functools.partial(self.post_message_sync, message, image_path, image=image)
+        )
@@ -0,0 +1,121 @@
+"""Channel sets: several accounts/channels per platform
+
+By default every platform has one channel built from the global settings
+(TELEGRAM_CHANNEL_ID, DISCORD_BOT_TOKEN, ...). More channels can be added in
+two ways, and each channel only needs the settings that differ:
+
+1. A channel file (CHANNELS_FILE, YAML):
+
+    Telegram:
+      - name: moonhome
+        channel_id: "@moonhome"
+      - name: lunar-news
+        channel_id: "-1001234567890"
+        bot_token: "123:other-bot"
+    Discord:
+      - name: community
+        channel_id: "123456789012345678"
+
+   Keys are the platform settings without the platform prefix
+   (channel_id -> TELEGRAM_CHANNEL_ID); full setting names work too.
+
+2. Indexed environment variables: TELEGRAM_CHANNEL_ID_2, DISCORD_CHANNEL_ID_3, ...
+   An index may also override other settings, e.g. TELEGRAM_BOT_TOKEN_2.
+
+Channels are addressed as "Platform" (the default channel) or "Platform:name".
+"""
+
+import logging
+import os
+import re
+from typing import Dict, List, Sequence
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+_channel_file_cache = None
+
+
+def platform_of(platform_key: str) -> str:
+    """Get the platform name of a channel key ("Telegram:moonhome" -> "Telegram")"""
+    return platform_key.split(":", 1)[0]
+
+
+class Channel:
+    """One account/channel of a platform; its settings override the global configuration"""
+
+    def __init__(self, platform: str, name: str = None, settings: Dict[str, str] = None):
+        self.platform = platform
+        self.name = name
+        self.settings = settings or {}
+
+    @property
+    def key(self) -> str:
+        return self.platform if self.name is None else f"{self.platform}:{self.name}"
+
+    def get(self, setting: str, default=None):
+        """Get a setting for this channel, falling back to Config and then the environment"""
+        value = self.settings.get(setting)
+        if value is None:
+            value = getattr(Config, setting, None) or os.getenv(setting)
+        return value if value is not None else default
+
+    def missing_settings(self, required_settings: Sequence[str]) -> List[str]:
+        return [setting for setting in required_settings if not self.get(setting)]
+
+
+def _setting_name(platform: str, key: str, required_settings: Sequence[str]) -> str:
+    """Map a channel file key (channel_id) to its setting name (TELEGRAM_CHANNEL_ID)"""
+    if key.upper() in required_settings or key.upper().startswith(f"{platform.upper()}_"):
+        return key.upper()
+    return f"{platform.upper()}_{key.upper()}"
+
+
+def _read_channel_file() -> Dict:
+    global _channel_file_cache
+    if _channel_file_cache is not None:
+        return _channel_file_cache
+
+    _channel_file_cache = {}
+    if not Config.CHANNELS_FILE or not os.path.exists(Config.CHANNELS_FILE):
+        return _channel_file_cache
+
+    try:
+        import yaml
+    except ImportError:
+        logger.error(f"PyYAML is required to read {Config.CHANNELS_FILE}")
+        return _channel_file_cache
+
+    with open(Config.CHANNELS_FILE, 'r', encoding='utf-8') as channels_file:
+        _channel_file_cache = yaml.safe_load(channels_file) or {}
+    return _channel_file_cache
+
+
+def load_channels(platform: str, required_settings: Sequence[str]) -> List[Channel]:
+    """Get every channel configured for a platform, the default channel first"""
+    channels = [Channel(platform)]
+
+    # Indexed environment variables
+    indexes = set()
+    for setting in required_settings:
+        pattern = re.compile(rf"^{re.escape(setting)}_(\d+)$")
+        indexes.update(int(match.group(1)) for match in map(pattern.match, os.environ) if match)
+    for index in sorted(indexes):
+        settings = {
+            setting: os.environ[f"{setting}_{index}"]
+            for setting in required_settings
+            if f"{setting}_{index}" in os.environ
+        }
+        channels.append(Channel(platform, str(index), settings))
+
+    # Channel file
+    for number, entry in enumerate(_read_channel_file().get(platform) or [], start=1):
+        entry = dict(entry)
+        name = str(entry.pop("name", f"file{number}"))
+        settings = {
+            _setting_name(platform, key, required_settings): str(value)
+            for key, value in entry.items()
+        }
+        channels.append(Channel(platform, name, settings))
+
+    return channels
@@ -0,0 +1,178 @@
+"""Discord poster, using the Discord REST API over aiohttp"""
+
+import logging
+import time
+from typing import Dict
+import aiohttp
+from config import Config
+from media import SharedImage, use_image
+from posters.base import BasePoster
+from posters.channels import Channel
+
+logger = logging.getLogger(__name__)
+
+
+class DiscordPoster(BasePoster):
+    """Handles posting to Discord channels using webhook API"""
+    
+    platform = "Discord"
+    required_settings = Config.PLATFORM_SETTINGS["Discord"]
+    
+    def __init__(self, channel: Channel = None):
+        super().__init__(channel)
+        channel_id = self.channel.get('DISCORD_CHANNEL_ID')
+        token = self.channel.get('DISCORD_BOT_TOKEN')
+        if not channel_id or not token:
+            raise ValueError("Discord configuration missing. Please set DISCORD_BOT_TOKEN and DISCORD_CHANNEL_ID in your .env file")
+        
+        try:
+            self.channel_id = int(channel_id)
+        except (ValueError, TypeError):
+            raise ValueError(f"Invalid Discord channel ID: {channel_id}. Channel ID must be a numeric string.")
+        
+        self.token = token
+        self.base_url = Config.DISCORD_API_BASE_URL.rstrip("/")
+        self._session = None
+        # Channel ID -> monotonic time until which a successful validation is trusted
+        self._validated_channels: Dict[int, float] = {}
+    
+    async def _get_session(self):
+        """Get the long-lived HTTP session, creating it on first use
+        
+        The session keeps connections to the Discord API alive and caches DNS lookups, so
+        consecutive requests reuse the same TLS connection instead of opening a new one.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=Config.DISCORD_POOL_SIZE,
+                ttl_dns_cache=Config.DISCORD_DNS_CACHE_TTL,
+                keepalive_timeout=60
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"Authorization": f"Bot {self.token}"}
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the HTTP session and its pooled connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def validate_channel_access(self) -> bool:
+        """Validate that the bot can access the specified channel"""
+        try:
+            session = await self._get_session()
+            async with session.get(f"{self.base_url}/channels/{self.channel_id}") as response:
+                if response.status == 200:
+                    channel_data = await response.json()
+                    logger.info(f"Discord channel validation successful: #{channel_data.get('name', 'Unknown')}")
+                    return True
+                elif response.status == 404:
+                    logger.error(f"Discord channel not found (ID: {self.channel_id}). Please check:")
+                    logger.error("1. The channel ID is correct")
+                    logger.error("2. The bot has access to the channel")
+                    logger.error("3. The bot has the necessary permissions")
+                    return False
+                else:
+                    error_text = await response.text()
+                    logger.error(f"Discord channel validation failed (HTTP {response.status}): {error_text}")
+                    return False
+        except Exception as e:
+            logger.error(f"Error validating Discord channel access: {str(e)}")
+            return False
+    
+    async def ensure_channel_access(self) -> bool:
+        """Validate channel access, reusing a cached result until DISCORD_VALIDATION_TTL expires"""
+        valid_until = self._validated_channels.get(self.channel_id)
+        if valid_until is not None and time.monotonic() < valid_until:
+            return True
+        
+        if not await self.validate_channel_access():
+            return False
+        
+        self._validated_channels[self.channel_id] = time.monotonic() + Config.DISCORD_VALIDATION_TTL
+        return True
+    
+    def invalidate_channel_access(self):
+        """Forget the cached validation so the next post checks the channel again"""
+        self._validated_channels.pop(self.channel_id, None)
+    
+    @staticmethod
+    def _rate_limit_info(response) -> Dict[str, float]:
+        """Read Discord's X-RateLimit-* headers from a response"""
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset_after = response.headers.get("X-RateLimit-Reset-After")
+        if remaining is None or reset_after is None:
+            return {}
+        return {"remaining": int(remaining), "reset_after": float(reset_after)}
+    
+    async def _send_message(self, session, message: str, **request_kwargs) -> Dict[str, bool]:
+        """Send a create-message request and turn the response into a result"""
+        async with session.post(
+            f"{self.base_url}/channels/{self.channel_id}/messages",
+            **request_kwargs
+        ) as response:
+            rate_limit = self._rate_limit_info(response)
+            
+            if response.status == 200:
+                content = "image + message" if "data" in request_kwargs else "message"
+                logger.info(f"Successfully posted {content} to Discord: {message[:50]}...")
+                message_data = await response.json()
+                return {"success": True, "platform": "Discord", "post_id": message_data.get("id"), "rate_limit": rate_limit}
+            
+            if response.status == 429:
+                # Discord sends the exact wait time in the body (and Retry-After header)
+                error_data = await response.json(content_type=None)
+                retry_after = float(error_data.get("retry_after") or response.headers.get("Retry-After", 1))
+                return {
+                    "success": False,
+                    "platform": "Discord",
+                    "error": f"HTTP 429: rate limited, retry after {retry_after}s",
+                    "rate_limited": True,
+                    "retry_after": retry_after,
+                    "rate_limit": rate_limit
+                }
+            
+            if response.status in (403, 404):
+                self.invalidate_channel_access()
+            error_text = await response.text()
+            raise Exception(f"HTTP {response.status}: {error_text}")
+    
+    async def post_message(self, message: str, image_path: str = None, image: SharedImage = None) -> Dict[str, bool]:
+        """Post message to Discord channel with optional image"""
+        try:
+            # First validate channel access (cached, so steady-state posts skip this request)
+            if not await self.ensure_channel_access():
+                return {"success": False, "platform": "Discord", "error": "Channel validation failed. Please check your Discord configuration."}
+            
+            session = await self._get_session()
+            
+            # Prepare the payload
+            payload = {
+                "content": message
+            }
+            
+            # If there's an image, we need to use multipart form data
+            if image_path or image:
+                with use_image(image_path, image) as shared_image:
+                    # Check file size (Discord has a 8MB limit for most servers)
+                    max_size = 8 * 1024 * 1024  # 8MB
+                    if shared_image.size > max_size:
+                        raise Exception(f"Image file too large: {shared_image.size} bytes (max: {max_size} bytes)")
+                    
+                    data = aiohttp.FormData()
+                    data.add_field('content', message)
+                    # The upload is sent straight from the shared mapping, without copying the file
+                    data.add_field('file', shared_image.view(), filename=shared_image.filename,
+                                   content_type=shared_image.content_type)
+                    
+                    return await self._send_message(session, message, data=data)
+            else:
+                # Text only message
+                return await self._send_message(session, message, json=payload)
+            
+        except Exception as e:
+            logger.error(f"Failed to post to Discord: {str(e)}")
+            return {"success": False, "platform": "Discord", "error": str(e)}
@@ -0,0 +1,59 @@
+"""Facebook poster, using facebook-sdk"""
+
+import logging
+from typing import Dict
+import facebook
+from config import Config
+from media import SharedImage, use_image
+from posters.base import SyncPoster
+from posters.channels import Channel
+
+logger = logging.getLogger(__name__)
+
+# facebook-sdk builds every request URL from this module constant
+facebook.FACEBOOK_GRAPH_URL = Config.FACEBOOK_GRAPH_URL
+
+
+class FacebookPoster(SyncPoster):
+    """Handles posting to Facebook groups"""
+    
+    platform = "Facebook"
+    required_settings = Config.PLATFORM_SETTINGS["Facebook"]
+    
+    def __init__(self, channel: Channel = None):
+        super().__init__(channel)
+        self.graph = facebook.GraphAPI(access_token=self.channel.get('FACEBOOK_ACCESS_TOKEN'), version="3.1")
+        self.group_id = self.channel.get('FACEBOOK_GROUP_ID')
+    
+    def post_message_sync(self, message: str, image_path: str = None, image: SharedImage = None) -> Dict[str, bool]:
+        """Post message to Facebook group with optional image"""
+        try:
+            if image_path or image:
+                # Post with image, uploaded as a multipart file from the shared buffer
+                with use_image(image_path, image) as shared_image:
+                    response = self.graph.put_photo(
+                        image=(shared_image.filename, shared_image.open(), shared_image.content_type),
+                        album_path=f"{self.group_id}/photos",
+                        message=message
+                    )
+                logger.info(f"Successfully posted image + message to Facebook: {message[:50]}...")
+            else:
+                # Post text only
+                response = self.graph.put_object(
+                    parent_object=self.group_id,
+                    connection_name="feed",
+                    message=message
+                )
+                logger.info(f"Successfully posted to Facebook: {message[:50]}...")
+            
+            return {"success": True, "platform": "Facebook", "post_id": response.get('id')}
+        except facebook.GraphAPIError as e:
+            logger.error(f"Failed to post to Facebook: {str(e)}")
+            result = {"success": False, "platform": "Facebook", "error": str(e)}
+            # Graph API throttling error codes; Facebook doesn't say how long to wait
+            if e.code in (4, 17, 32, 613):
+                result["rate_limited"] = True
+            return result
+        except Exception as e:
+            logger.error(f"Failed to post to Facebook: {str(e)}")
+            return {"success": False, "platform": "Facebook", "error": str(e)}
@@ -0,0 +1,198 @@
+"""Telegram poster, using python-telegram-bot"""
+
+import asyncio
+import logging
+from contextlib import ExitStack
+from typing import Awaitable, Callable, Dict, List, Tuple
+from telegram import Bot, InputMediaPhoto
+from telegram.error import RetryAfter
+from telegram.request import HTTPXRequest
+from config import Config
+from media import SharedImage, use_image
+from posters.base import BasePoster
+from posters.channels import Channel
+
+logger = logging.getLogger(__name__)
+
+
+def _retry_after_seconds(error: RetryAfter) -> float:
+    # retry_after is an int or a timedelta depending on the python-telegram-bot version
+    return error.retry_after.total_seconds() if hasattr(error.retry_after, "total_seconds") else float(error.retry_after)
+
+
+class TelegramPoster(BasePoster):
+    """Handles posting to Telegram channels"""
+    
+    platform = "Telegram"
+    required_settings = Config.PLATFORM_SETTINGS["Telegram"]
+    
+    # Telegram limits
+    CAPTION_LIMIT = 1024
+    MEDIA_GROUP_LIMIT = 10
+    
+    def __init__(self, channel: Channel = None):
+        super().__init__(channel)
+        # One bot with a pooled HTTP client, initialized once and reused for every call
+        self.bot = Bot(
+            token=self.channel.get('TELEGRAM_BOT_TOKEN'),
+            base_url=Config.TELEGRAM_API_BASE_URL,
+            request=HTTPXRequest(connection_pool_size=Config.TELEGRAM_POOL_SIZE)
+        )
+        self.channel_id = self.channel.get('TELEGRAM_CHANNEL_ID')
+        self._initialized = False
+    
+    async def _get_bot(self) -> Bot:
+        """Get the bot, initializing its HTTP pool on first use"""
+        if not self._initialized:
+            await self.bot.initialize()
+            self._initialized = True
+        return self.bot
+    
+    async def close(self):
+        """Shut down the bot's HTTP pool"""
+        if self._initialized:
+            await self.bot.shutdown()
+            self._initialized = False
+    
+    def _failure(self, error: Exception) -> Dict[str, bool]:
+        """Turn an exception into a failed result, passing on Telegram's flood wait"""
+        if isinstance(error, RetryAfter):
+            retry_after = _retry_after_seconds(error)
+            logger.warning(f"Telegram rate limit hit, retry after {retry_after}s")
+            return {"success": False, "platform": "Telegram", "error": str(error), "rate_limited": True, "retry_after": retry_after}
+        
+        logger.error(f"Failed to post to Telegram: {str(error)}")
+        return {"success": False, "platform": "Telegram", "error": str(error)}
+    
+    async def _send_follow_up(self, send: Callable[[], Awaitable]):
+        """Make a request that follows an already posted part of the same post
+
+        Telegram flood waits are waited out here (up to MAX_RETRIES times) instead of being
+        reported as a rate-limited post, which would make the whole post be retried and the
+        parts already sent be posted again. `send` builds a new request for every attempt.
+        """
+        attempt = 0
+        while True:
+            try:
+                return await send()
+            except RetryAfter as e:
+                if attempt >= Config.MAX_RETRIES:
+                    raise
+                attempt += 1
+                retry_after = _retry_after_seconds(e)
+                logger.warning(f"Telegram rate limit hit mid-post, retrying in {retry_after}s")
+                await asyncio.sleep(retry_after)
+    
+    async def post_message(self, message: str, image_path: str = None, image: SharedImage = None) -> Dict[str, bool]:
+        """Post message to Telegram channel with optional image
+        
+        Messages too long for a photo caption are sent as the photo followed by the full text.
+        """
+        try:
+            bot = await self._get_bot()
+            
+            if image_path or image:
+                caption = message if len(message) <= self.CAPTION_LIMIT else None
+                
+                # Post with image
+                with use_image(image_path, image) as shared_image:
+                    sent_message = await bot.send_photo(
+                        chat_id=self.channel_id,
+                        photo=shared_image.open(),
+                        caption=caption
+                    )
+                
+                if caption is None:
+                    # Send the full text after the photo instead of truncating it. The photo is
+                    # posted already, so a failure here must not make the whole post be retried.
+                    try:
+                        await self._send_follow_up(lambda: bot.send_message(chat_id=self.channel_id, text=message))
+                    except Exception as e:
+                        logger.error(f"Posted image to Telegram, but the follow-up message failed: {str(e)}")
+                        return {
+                            "success": True,
+                            "platform": "Telegram",
+                            "post_id": sent_message.message_id,
+                            "follow_up_error": str(e)
+                        }
+                    logger.info(f"Successfully posted image + follow-up message to Telegram: {message[:50]}...")
+                else:
+                    logger.info(f"Successfully posted image + message to Telegram: {message[:50]}...")
+            else:
+                # Post text only (no character limit for text messages)
+                sent_message = await bot.send_message(chat_id=self.channel_id, text=message)
+                logger.info(f"Successfully posted to Telegram: {message[:50]}...")
+            
+            return {"success": True, "platform": "Telegram", "post_id": sent_message.message_id}
+        except Exception as e:
+            return self._failure(e)
+    
+    def _album_chunks(self, count: int) -> List[Tuple[int, int]]:
+        """Split `count` images into (start, end) groups of 2 to MEDIA_GROUP_LIMIT images
+
+        send_media_group needs at least 2 items, so a single leftover image is balanced
+        with the group before it; only a lone image is posted on its own.
+        """
+        chunks = [
+            [start, min(start + self.MEDIA_GROUP_LIMIT, count)]
+            for start in range(0, count, self.MEDIA_GROUP_LIMIT)
+        ]
+        if len(chunks) > 1 and chunks[-1][1] - chunks[-1][0] == 1:
+            chunks[-2][1] -= 1
+            chunks[-1][0] -= 1
+        return [(start, end) for start, end in chunks]
+    
+    async def post_album(self, message: str, image_paths: List[str]) -> Dict[str, bool]:
+        """Post several images as albums of up to 10 photos, with the message as the caption
+        
+        Every album is a single send_media_group call (a single image is sent as a photo).
+        Messages too long for a caption are sent as a text message after the albums. If a
+        later request fails, the result says what was posted already ("partial", "post_ids")
+        and isn't marked rate limited, so the albums already sent aren't posted again.
+        """
+        caption = message if len(message) <= self.CAPTION_LIMIT else None
+        post_ids = []
+        try:
+            bot = await self._get_bot()
+            
+            with ExitStack() as stack:
+                images = [stack.enter_context(use_image(image_path)) for image_path in image_paths]
+                
+                for start, end in self._album_chunks(len(images)):
+                    # The caption of the first photo is shown for the whole album
+                    group_caption = caption if start == 0 else None
+                    if end - start == 1:
+                        send = lambda: bot.send_photo(
+                            chat_id=self.channel_id, photo=images[start].open(), caption=group_caption
+                        )
+                    else:
+                        send = lambda: bot.send_media_group(chat_id=self.channel_id, media=[
+                            InputMediaPhoto(media=shared_image.open(), caption=group_caption if index == 0 else None)
+                            for index, shared_image in enumerate(images[start:end])
+                        ])
+                    
+                    # Only the first request may report a rate limit for the whole post
+                    sent = await (self._send_follow_up(send) if post_ids else send())
+                    sent_messages = sent if isinstance(sent, (list, tuple)) else [sent]
+                    post_ids.extend(sent_message.message_id for sent_message in sent_messages)
+                
+                if caption is None:
+                    sent_message = await self._send_follow_up(
+                        lambda: bot.send_message(chat_id=self.channel_id, text=message)
+                    )
+                    post_ids.append(sent_message.message_id)
+            
+            logger.info(f"Successfully posted album of {len(image_paths)} images to Telegram: {message[:50]}...")
+            return {"success": True, "platform": "Telegram", "post_id": post_ids[0] if post_ids else None, "post_ids": post_ids}
+        except Exception as e:
+            if not post_ids:
+                return self._failure(e)
+            logger.error(f"Telegram album only partly posted ({len(post_ids)} messages): {str(e)}")
+            return {
+                "success": False,
+                "platform": "Telegram",
+                "error": str(e),
+                "partial": True,
+                "post_id": post_ids[0],
+                "post_ids": post_ids
+            }
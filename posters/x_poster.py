@@ -0,0 +1,101 @@
+"""X (Twitter) poster, using tweepy"""
+
+import logging
+import threading
+import time
+from typing import Dict, Tuple
+import tweepy
+from config import Config
+from media import SharedImage, use_image
+from posters.base import SyncPoster
+from posters.channels import Channel
+
+logger = logging.getLogger(__name__)
+
+
+class XPoster(SyncPoster):
+    """Handles posting to X (Twitter)"""
+    
+    platform = "X"
+    required_settings = Config.PLATFORM_SETTINGS["X"]
+    
+    def __init__(self, channel: Channel = None):
+        super().__init__(channel)
+        credentials = [
+            self.channel.get('X_API_KEY'),
+            self.channel.get('X_API_SECRET'),
+            self.channel.get('X_ACCESS_TOKEN'),
+            self.channel.get('X_ACCESS_TOKEN_SECRET')
+        ]
+        self.client = tweepy.Client(
+            consumer_key=credentials[0],
+            consumer_secret=credentials[1],
+            access_token=credentials[2],
+            access_token_secret=credentials[3]
+        )
+        # Media upload is only available in the v1.1 API
+        self.api = tweepy.API(tweepy.OAuth1UserHandler(*credentials))
+        # Image SHA-256 -> (media ID, expiry time), so the same image isn't uploaded for every tweet
+        self._media_ids: Dict[str, Tuple[str, float]] = {}
+        self._media_lock = threading.Lock()
+    
+    @staticmethod
+    def _media_category(content_type: str) -> str:
+        if content_type.startswith("video/"):
+            return "tweet_video"
+        if content_type == "image/gif":
+            return "tweet_gif"
+        return "tweet_image"
+    
+    def upload_media(self, image: SharedImage) -> str:
+        """Upload an image or video and return its media ID, reusing a recent upload of the same file
+        
+        Videos, GIFs and files over X_CHUNKED_UPLOAD_THRESHOLD use the chunked
+        INIT/APPEND/FINALIZE upload, which also waits for X to finish processing.
+        """
+        media_key = image.sha256()
+        with self._media_lock:
+            cached = self._media_ids.get(media_key)
+            if cached and cached[1] > time.monotonic():
+                logger.info(f"Reusing X media ID {cached[0]} for {image.filename}")
+                return cached[0]
+        
+        media_category = self._media_category(image.content_type)
+        chunked = media_category != "tweet_image" or image.size > Config.X_CHUNKED_UPLOAD_THRESHOLD
+        media = self.api.media_upload(
+            filename=image.filename,
+            file=image.open(),
+            chunked=chunked,
+            media_category=media_category
+        )
+        
+        with self._media_lock:
+            self._media_ids[media_key] = (media.media_id_string, time.monotonic() + Config.X_MEDIA_ID_TTL)
+        logger.info(f"Uploaded {image.filename} to X ({image.size} bytes, media ID {media.media_id_string})")
+        return media.media_id_string
+    
+    def post_message_sync(self, message: str, image_path: str = None, image: SharedImage = None) -> Dict[str, bool]:
+        """Post message to X (Twitter) with optional image or video"""
+        try:
+            # Ensure message length is within Twitter's limit
+            if len(message) > 280:
+                message = message[:277] + "..."
+            
+            media_ids = None
+            if image_path or image:
+                with use_image(image_path, image) as shared_image:
+                    media_ids = [self.upload_media(shared_image)]
+            
+            response = self.client.create_tweet(text=message, media_ids=media_ids)
+            content = "image + message" if media_ids else "message"
+            logger.info(f"Successfully posted {content} to X: {message[:50]}...")
+            return {"success": True, "platform": "X", "tweet_id": response.data['id']}
+        except tweepy.TooManyRequests as e:
+            # x-rate-limit-reset is the epoch second at which the quota window resets
+            reset_at = e.response.headers.get("x-rate-limit-reset") if e.response is not None else None
+            retry_after = max(0.0, int(reset_at) - time.time()) if reset_at else None
+            logger.warning(f"X rate limit hit, retry after {retry_after}s")
+            return {"success": False, "platform": "X", "error": str(e), "rate_limited": True, "retry_after": retry_after}
+        except Exception as e:
+            logger.error(f"Failed to post to X: {str(e)}")
+            return {"success": False, "platform": "X", "error": str(e)}
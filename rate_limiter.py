@@ -0,0 +1,116 @@
+"""Per-platform rate limiting and retry backoff for the social media posters"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, Optional
+from config import Config
+from posters.channels import platform_of
+
+logger = logging.getLogger(__name__)
+
+
+def backoff_delay(attempt: int, retry_after: float = None,
+                  base_delay: float = None, max_delay: float = None) -> float:
+    """Get the delay before retry number `attempt` (0-based)
+
+    Uses exponential backoff with full jitter. A server-provided retry_after
+    is treated as the minimum wait, with a little jitter on top so that
+    concurrent workers don't all retry at the same instant. The delay never
+    exceeds max_delay: callers give up instead of retrying when the server
+    asks for a longer wait.
+    """
+    if base_delay is None:
+        base_delay = Config.RETRY_BASE_DELAY
+    if max_delay is None:
+        max_delay = Config.RETRY_MAX_DELAY
+
+    delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, retry_after + random.uniform(0, base_delay))
+    return min(delay, max_delay)
+
+
+class TokenBucket:
+    """Token bucket that can also be paused until a server-announced reset time"""
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate  # Tokens per second, 0 disables pacing
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float):
+        if self.rate > 0:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        else:
+            self.tokens = self.capacity
+        self.updated_at = now
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds the caller must wait before using it"""
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens -= 1
+
+        wait_time = 0.0
+        if self.tokens < 0 and self.rate > 0:
+            wait_time = -self.tokens / self.rate
+        return max(wait_time, self.blocked_until - now)
+
+    def blocked_for(self) -> float:
+        """Seconds until a server-announced reset, 0 if not blocked"""
+        return max(0.0, self.blocked_until - time.monotonic())
+
+    def block_for(self, seconds: float):
+        """Hold back all requests for the given number of seconds"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+class RateLimitScheduler:
+    """Schedules posts per platform according to local pacing and platform rate limit responses
+
+    Posters report rate limit information in their result dictionaries:
+    "rate_limited"/"retry_after" on a rejected post, and "rate_limit" with
+    "remaining"/"reset_after" when the platform returns quota headers.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def _bucket(self, platform_name: str) -> TokenBucket:
+        # Every channel ("Telegram:moonhome") has its own bucket, paced by its platform's delay
+        if platform_name not in self._buckets:
+            post_delay = Config.get_post_delay(platform_of(platform_name))
+            rate = 1 / post_delay if post_delay > 0 else 0
+            self._buckets[platform_name] = TokenBucket(rate, Config.RATE_LIMIT_BURST)
+        return self._buckets[platform_name]
+
+    def blocked_for(self, platform_name: str) -> float:
+        """Seconds until the platform's rate limit resets, 0 if it isn't rate limited"""
+        return self._bucket(platform_name).blocked_for()
+
+    async def acquire(self, platform_name: str) -> float:
+        """Wait until the platform may be posted to, returning the seconds waited"""
+        wait_time = self._bucket(platform_name).reserve()
+        if wait_time > 0:
+            logger.info(f"Waiting {wait_time:.1f}s before posting to {platform_name}")
+            await asyncio.sleep(wait_time)
+        return max(wait_time, 0.0)
+
+    def update_from_result(self, platform_name: str, result: Dict) -> Optional[float]:
+        """Apply rate limit information from a poster result, returning the server retry hint if any"""
+        bucket = self._bucket(platform_name)
+
+        rate_limit = result.get("rate_limit") or {}
+        if rate_limit.get("remaining") == 0 and rate_limit.get("reset_after"):
+            logger.info(f"{platform_name} rate limit exhausted, pausing for {rate_limit['reset_after']:.1f}s")
+            bucket.block_for(rate_limit["reset_after"])
+
+        retry_after = result.get("retry_after")
+        if retry_after:
+            logger.warning(f"{platform_name} rate limited, retry after {retry_after:.1f}s")
+            bucket.block_for(retry_after)
+        return retry_after
@@ -0,0 +1,81 @@
+"""Local cache of Gemini responses
+
+Responses are keyed by a hash of the model, the prompt and the generation
+config, so reruns of the same prompt (during development, testing or on
+staging) are answered from disk without spending quota. Entries expire after
+GEMINI_CACHE_TTL seconds, and the least recently used ones are evicted once
+there are more than GEMINI_CACHE_MAX_ENTRIES.
+
+The cache is off unless GEMINI_CACHE=true: the posting prompts never change,
+so in production every run needs a fresh response.
+"""
+
+import hashlib
+import json
+import time
+from typing import Dict, Optional
+from config import Config
+from utils import open_sqlite
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    text TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used_at);
+"""
+
+
+def make_cache_key(model: str, prompt: str, generation_config: Dict = None) -> str:
+    """Get the cache key of a request: a SHA-256 of its model, prompt and generation config"""
+    request = json.dumps({"model": model, "prompt": prompt, "config": generation_config or {}}, sort_keys=True)
+    return hashlib.sha256(request.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed TTL + LRU cache of generated text"""
+
+    def __init__(self, db_path: str = None, ttl: float = None, max_entries: int = None):
+        self.db_path = db_path or Config.GEMINI_CACHE_PATH
+        self.ttl = ttl if ttl is not None else Config.GEMINI_CACHE_TTL
+        self.max_entries = max_entries if max_entries is not None else Config.GEMINI_CACHE_MAX_ENTRIES
+        self.conn = open_sqlite(self.db_path, SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response, unless it's missing or expired"""
+        row = self.conn.execute("SELECT text, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+
+        now = time.time()
+        with self.conn:
+            if now - row["created_at"] > self.ttl:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self.conn.execute("UPDATE responses SET last_used_at = ? WHERE key = ?", (now, key))
+        return row["text"]
+
+    def store(self, key: str, model: str, text: str):
+        """Cache a response, evicting the least recently used ones over max_entries"""
+        now = time.time()
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, text, created_at, last_used_at) VALUES (?, ?, ?, ?, ?)",
+                (key, model, text, now, now)
+            )
+            self.conn.execute(
+                """DELETE FROM responses WHERE key NOT IN
+                   (SELECT key FROM responses ORDER BY last_used_at DESC LIMIT ?)""",
+                (self.max_entries,)
+            )
+
+    def clear(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM responses")
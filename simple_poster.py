@@ -7,12 +7,12 @@ then fetches and posts NASA APOD content
 
 import asyncio
 import os
-import random
-import glob
-from social_media_poster import SocialMediaPoster
+from social_media_poster import SocialMediaPoster, print_metrics_summary
 from nasa_apod import NASAAPOD
-from gg_example import create_new_message
+from gg_example import save_message
+from content_generator import ContentGenerator
 from config import Config
+from image_pool import ImagePool
 
 
 def read_message_from_file():
@@ -39,31 +39,34 @@ def read_message_from_file():
         return None
 
 
-def get_random_image():
-    """Get a random image from the images folder"""
-    images_folder = "images"
+def get_random_images(pool, count=1):
+    """Get up to `count` different random images from the images folder, favouring images not posted for a while
     
-    if not os.path.exists(images_folder):
-        print(f"❌ Images folder not found: {images_folder}")
-        return None
-    
-    # Get all image files from the images folder
-    image_extensions = ['*.jpg', '*.jpeg', '*.png', '*.gif', '*.bmp', '*.webp']
-    image_files = []
+    Hashes new images while refreshing the pool index, so call it in a thread.
+    """
+    if not os.path.exists(pool.images_dir):
+        print(f"❌ Images folder not found: {pool.images_dir}")
+        return []
     
-    for extension in image_extensions:
-        image_files.extend(glob.glob(os.path.join(images_folder, extension)))
-        image_files.extend(glob.glob(os.path.join(images_folder, extension.upper())))
+    # The pool index only rescans the folder when files were added or removed
+    random_images = pool.select_many(count)
     
-    if not image_files:
+    if not random_images:
         print("📁 Images folder is empty")
-        return None
+        return []
     
-    # Select a random image
-    random_image = random.choice(image_files)
-    print(f"🎲 Selected random image: {random_image}")
+    for random_image in random_images:
+        print(f"🎲 Selected random image: {random_image}")
     
-    return random_image
+    return random_images
+
+
+def mark_images_posted(pool, image_paths):
+    """Record the images as posted, so they are less likely to be picked again soon (or delete them, see DELETE_POSTED_IMAGES)"""
+    for image_path in image_paths:
+        pool.mark_posted(image_path)
+        if Config.DELETE_POSTED_IMAGES:
+            delete_image(image_path)
 
 
 def delete_image(image_path):
@@ -81,15 +84,17 @@ def delete_image(image_path):
         return False
 
 
-async def post_daily_message_with_image(poster: SocialMediaPoster):
+async def post_daily_message_with_image(poster: SocialMediaPoster, generator: ContentGenerator, pool: ImagePool):
     """Post daily message with random image from images folder"""
     print("\n" + "="*50)
     print("📅 POSTING DAILY MESSAGE WITH RANDOM IMAGE")
     print("="*50)
     
-    # Create new message using create_new_message(2)
+    # The daily message (type 2) has been generating in the background since the run started
     print("🤖 Creating new daily message...")
-    create_new_message(2)
+    daily_message = await generator.next_message(2)
+    if daily_message:
+        save_message(daily_message)
     
     # Read the newly created message
     message = read_message_from_file()
@@ -99,15 +104,16 @@ async def post_daily_message_with_image(poster: SocialMediaPoster):
     
     print(f"📝 Daily message: {message[:100]}{'...' if len(message) > 100 else ''}")
     
-    # Get random image from images folder
-    random_image = get_random_image()
+    # Get random images from images folder (DAILY_IMAGE_COUNT > 1 posts an album where the platform has them).
+    # Indexing new images hashes them, so it runs in a thread while message generation keeps going
+    random_images = await asyncio.to_thread(get_random_images, pool, Config.DAILY_IMAGE_COUNT)
     
-    if random_image:
-        print(f"🖼️  Posting with image: {random_image}")
+    if random_images:
+        print(f"🖼️  Posting with image: {', '.join(random_images)}")
         
         # Post message with image to all platforms
         print("🚀 Posting daily message with image to all platforms...")
-        results = await poster.post_to_all_platforms(message, random_image)
+        results = await poster.post_album_to_all_platforms(message, random_images)
         
         # Display posting results
         print("\n📊 Daily Message Posting Results:")
@@ -132,12 +138,12 @@ async def post_daily_message_with_image(poster: SocialMediaPoster):
         print("-" * 40)
         print(f"📈 Daily Message Summary: {successful_posts} successful, {failed_posts} failed")
         
-        # Delete image if at least one post was successful
+        # Record the image as posted (or delete it, see DELETE_POSTED_IMAGES) if at least one post was successful
         if successful_posts > 0:
             print("🎉 Daily message with image posted successfully!")
-            delete_image(random_image)
+            await asyncio.to_thread(mark_images_posted, pool, random_images)
         else:
-            print("❌ No platforms were posted to successfully. Image not deleted.")
+            print("❌ No platforms were posted to successfully.")
     else:
         # No image available, post text only
         print("📝 No images available, posting text-only message...")
@@ -175,17 +181,23 @@ async def post_daily_message_with_image(poster: SocialMediaPoster):
             print("❌ No platforms were posted to successfully.")
 
 
+def fetch_apod_content():
+    """Fetch the NASA APOD message and image (blocking, run in a thread)"""
+    nasa = NASAAPOD(Config.NASA_API_KEY)
+    try:
+        return nasa.get_apod_content()
+    finally:
+        nasa.close()
+
+
 async def post_nasa_apod(poster: SocialMediaPoster):
     """Fetch and post NASA APOD content"""
     print("\n" + "="*50)
     print("🔭 POSTING NASA ASTRONOMY PICTURE OF THE DAY")
     print("="*50)
     
-    # Initialize NASA APOD handler
-    nasa = NASAAPOD(Config.NASA_API_KEY)
-    
-    # Get APOD content
-    apod_message, image_path = nasa.get_apod_content()
+    # Get APOD content in a thread, so message generation keeps running meanwhile
+    apod_message, image_path = await asyncio.to_thread(fetch_apod_content)
     
     if not apod_message:
         print("❌ Failed to fetch NASA APOD data")
@@ -234,71 +246,83 @@ async def main():
     print("🚀 SOCIAL MEDIA BOT - AUTOMATIC POSTING")
     print("=" * 50)
 
-    # Create a new message
-    create_new_message(1)
-    
-    # Read message from file
-    message = read_message_from_file()
-    if not message:
-        return
-    
-    print(f"📝 Message to post: {message[:100]}{'...' if len(message) > 100 else ''}")
-    print()
-    
-    # Initialize poster
-    poster = SocialMediaPoster()
-    
-    # Check available platforms
-    available_platforms = list(poster.platforms.keys())
-    if not available_platforms:
-        print("❌ No platforms are configured!")
-        print("Please check your .env file and ensure API keys are set.")
-        return
-    
-    print(f"✅ Configured platforms: {', '.join(available_platforms)}")
-    print()
-    
-    # STEP 1: Post initial message to all platforms
-    print("🚀 Step 1: Posting initial message to all platforms...")
-    results = await poster.post_to_all_platforms(message)
-    
-    # Display initial posting results
-    print("\n📊 Initial Posting Results:")
-    print("-" * 40)
-    
-    successful_posts = 0
-    failed_posts = 0
-    
-    for result in results:
-        status = "✅ SUCCESS" if result["success"] else "❌ FAILED"
-        platform = result["platform"]
+    async with ContentGenerator() as generator:
+        # Generate both messages at once (unless they're buffered): the daily message is
+        # generated while the initial message and the APOD are being posted
+        generator.prefetch(1)
+        generator.prefetch(2)
+        generator.start_refill([1, 2])
+
+        # Get a new message (the previous one in smm_message.md is used if none is available)
+        new_message = await generator.next_message(1)
+        if new_message:
+            save_message(new_message)
         
-        if result["success"]:
-            successful_posts += 1
-            print(f"{status} - {platform}")
-        else:
-            failed_posts += 1
-            error = result.get("error", "Unknown error")
-            print(f"{status} - {platform}: {error}")
-    
-    # Initial posting summary
-    print("-" * 40)
-    print(f"📈 Initial Posting Summary: {successful_posts} successful, {failed_posts} failed")
-    
-    if successful_posts > 0:
-        print("🎉 Initial message posted successfully!")
-    else:
-        print("❌ No platforms were posted to successfully for initial message.")
-    
-    # STEP 2: Post NASA APOD content
-    await post_nasa_apod(poster)
-    
-    # STEP 3: Post daily message with random image
-    await post_daily_message_with_image(poster)
-    
-    print("\n" + "="*50)
-    print("🎉 ALL POSTING COMPLETED!")
-    print("="*50)
+        # Read message from file
+        message = read_message_from_file()
+        if not message:
+            return
+        
+        print(f"📝 Message to post: {message[:100]}{'...' if len(message) > 100 else ''}")
+        print()
+        
+        # Initialize poster
+        async with SocialMediaPoster() as poster:
+            # Check available platforms
+            available_platforms = list(poster.platforms.keys())
+            if not available_platforms:
+                print("❌ No platforms are configured!")
+                print("Please check your .env file and ensure API keys are set.")
+                return
+            
+            print(f"✅ Configured platforms: {', '.join(available_platforms)}")
+            print()
+            
+            # STEP 1: Post initial message to all platforms
+            print("🚀 Step 1: Posting initial message to all platforms...")
+            results = await poster.post_to_all_platforms(message)
+            
+            # Display initial posting results
+            print("\n📊 Initial Posting Results:")
+            print("-" * 40)
+            
+            successful_posts = 0
+            failed_posts = 0
+            
+            for result in results:
+                status = "✅ SUCCESS" if result["success"] else "❌ FAILED"
+                platform = result["platform"]
+            
+                if result["success"]:
+                    successful_posts += 1
+                    print(f"{status} - {platform}")
+                else:
+                    failed_posts += 1
+                    error = result.get("error", "Unknown error")
+                    print(f"{status} - {platform}: {error}")
+            
+            # Initial posting summary
+            print("-" * 40)
+            print(f"📈 Initial Posting Summary: {successful_posts} successful, {failed_posts} failed")
+            
+            if successful_posts > 0:
+                print("🎉 Initial message posted successfully!")
+            else:
+                print("❌ No platforms were posted to successfully for initial message.")
+            
+            # STEP 2: Post NASA APOD content
+            await post_nasa_apod(poster)
+            
+            # STEP 3: Post daily message with random image
+            # One image pool (and one index refresh) for selecting and marking the daily images
+            with ImagePool("images") as pool:
+                await post_daily_message_with_image(poster, generator, pool)
+            
+            print_metrics_summary(poster)
+            
+            print("\n" + "="*50)
+            print("🎉 ALL POSTING COMPLETED!")
+            print("="*50)
 
 
 if __name__ == "__main__":
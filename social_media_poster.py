@@ -1,14 +1,18 @@
 import asyncio
-import time
+import hashlib
 import logging
-from typing import List, Dict, Optional
-import requests
-import tweepy
-import facebook
-from telegram import Bot
-import discord
-from discord.ext import commands
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict
 from config import Config
+from image_variants import get_image_variant
+from media import SharedImage
+from metrics import PostingMetrics
+from posters import BasePoster, SyncPoster, load_channels, load_poster_class, missing_settings, required_settings
+from post_index import PostIndex, make_post_key
+from rate_limiter import RateLimitScheduler, backoff_delay
+from utils import file_sha256
 
 # Configure logging
 logging.basicConfig(
@@ -18,323 +22,351 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-class TelegramPoster:
-    """Handles posting to Telegram channels"""
+class SocialMediaPoster:
+    """Main class that coordinates posting to all platforms"""
     
     def __init__(self):
-        self.bot = Bot(token=Config.TELEGRAM_BOT_TOKEN)
-        self.channel_id = Config.TELEGRAM_CHANNEL_ID
-    
-    async def post_message(self, message: str, image_path: str = None) -> Dict[str, bool]:
-        """Post message to Telegram channel with optional image"""
-        try:
-            if image_path:
-                # Telegram has a 1024 character limit for captions
-                # Truncate message if it's too long for caption
-                if len(message) > 1024:
-                    # Try to truncate at a word boundary
-                    truncated_message = message[:1021]  # Leave room for "..."
-                    last_space = truncated_message.rfind(' ')
-                    if last_space > 900:  # If we can find a good word boundary
-                        truncated_message = message[:last_space] + "..."
-                    else:
-                        truncated_message = message[:1021] + "..."
-                    
-                    logger.info(f"Message truncated for Telegram caption: {len(message)} -> {len(truncated_message)} chars")
-                    caption = truncated_message
-                else:
-                    caption = message
+        # Only enabled platforms with complete configuration are set up, so the SDKs
+        # of other platforms are never imported. Each configured channel of a platform
+        # gets its own poster, keyed "Platform" (default channel) or "Platform:name".
+        self.platforms: Dict[str, BasePoster] = {}
+        missing_configs = []
+        for platform_name in Config.ENABLED_PLATFORMS:
+            try:
+                settings = required_settings(platform_name)
+                channels = [
+                    channel for channel in load_channels(platform_name, settings)
+                    if not missing_settings(platform_name, channel)
+                ]
+                if not channels:
+                    missing_configs.append(platform_name)
+                    continue
                 
-                # Post with image
-                with open(image_path, 'rb') as photo:
-                    await self.bot.send_photo(
-                        chat_id=self.channel_id,
-                        photo=photo,
-                        caption=caption
-                    )
-                logger.info(f"Successfully posted image + message to Telegram: {caption[:50]}...")
-            else:
-                # Post text only (no character limit for text messages)
-                await self.bot.send_message(chat_id=self.channel_id, text=message)
-                logger.info(f"Successfully posted to Telegram: {message[:50]}...")
-            
-            return {"success": True, "platform": "Telegram"}
-        except Exception as e:
-            logger.error(f"Failed to post to Telegram: {str(e)}")
-            return {"success": False, "platform": "Telegram", "error": str(e)}
-
-
-class DiscordPoster:
-    """Handles posting to Discord channels using webhook API"""
+                poster_class = load_poster_class(platform_name)
+                for channel in channels:
+                    try:
+                        self.platforms[channel.key] = poster_class(channel)
+                    except Exception as e:
+                        logger.error(f"Failed to set up {channel.key} poster: {str(e)}")
+            except Exception as e:
+                logger.error(f"Failed to set up {platform_name} poster: {str(e)}")
+        
+        if missing_configs:
+            logger.warning(f"Missing configuration for: {', '.join(missing_configs)}")
+        
+        # Sync SDKs (tweepy, facebook-sdk) run in a bounded thread pool so they don't block the event loop
+        self._executor = ThreadPoolExecutor(max_workers=Config.SYNC_POST_WORKERS, thread_name_prefix="sync-poster")
+        for poster in self.platforms.values():
+            if isinstance(poster, SyncPoster):
+                poster.executor = self._executor
+        # Per-platform token buckets, fed with the rate limit responses of each platform
+        self.scheduler = RateLimitScheduler()
+        # Record of what was already posted where, so reruns skip those posts
+        self.post_index = PostIndex() if Config.POST_DEDUP else None
+        # Per-platform limits on posts in flight across all channels of the platform
+        self._platform_limits: Dict[str, asyncio.Semaphore] = {}
+        # Latency, upload volume, retries and rate limit waits per platform (see METRICS_FILE)
+        self.metrics = PostingMetrics()
     
-    def __init__(self):
-        if not Config.DISCORD_CHANNEL_ID or not Config.DISCORD_BOT_TOKEN:
-            raise ValueError("Discord configuration missing. Please set DISCORD_BOT_TOKEN and DISCORD_CHANNEL_ID in your .env file")
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def close(self):
+        """Release platform sessions and the thread pool"""
+        for platform_name, poster in self.platforms.items():
+            try:
+                await poster.close()
+            except Exception as e:
+                logger.warning(f"Error closing {platform_name} poster: {str(e)}")
         
-        try:
-            self.channel_id = int(Config.DISCORD_CHANNEL_ID)
-        except (ValueError, TypeError):
-            raise ValueError(f"Invalid Discord channel ID: {Config.DISCORD_CHANNEL_ID}. Channel ID must be a numeric string.")
+        self._executor.shutdown(wait=False)
+        self.metrics.export()
+        if self.post_index:
+            self.post_index.close()
+    
+    def _select_targets(self, platforms: List[str] = None, all_channels: bool = False) -> Dict[str, BasePoster]:
+        """Get the posters of the selected channels (all of them without `platforms`)"""
+        return {
+            platform_name: poster for platform_name, poster in self.platforms.items()
+            if platforms is None or platform_name in platforms or (all_channels and poster.platform in platforms)
+        }
+    
+    def _platform_limit(self, platform: str) -> asyncio.Semaphore:
+        """Get the semaphore bounding concurrent posts to a platform"""
+        if platform not in self._platform_limits:
+            self._platform_limits[platform] = asyncio.Semaphore(Config.get_platform_concurrency(platform))
+        return self._platform_limits[platform]
+    
+    async def _post_to_platform(self, platform_name: str, poster: BasePoster, message: str, image: SharedImage = None,
+                                image_digest: str = None, album: List[str] = None) -> Dict[str, bool]:
+        """Post to a single platform, skipping posts it already has
+        
+        image_digest identifies the source image(s), so resized variants count as the same post.
+        With `album` the images are posted with the poster's post_album instead.
+        """
+        started_at = time.monotonic()
+        post_key = None
+        if self.post_index:
+            post_key = make_post_key(message, image_digest, platform_name)
+            previous_post = self.post_index.lookup(post_key)
+            if previous_post:
+                logger.info(f"Skipping {platform_name}: already posted on {previous_post['posted_at']}")
+                result = {
+                    "success": True,
+                    "platform": platform_name,
+                    "post_id": previous_post["post_id"],
+                    "duplicate": True
+                }
+                self.metrics.observe_post(platform_name, result, time.monotonic() - started_at)
+                return result
         
-        self.token = Config.DISCORD_BOT_TOKEN
-        self.base_url = "https://discord.com/api/v10"
+        result = await self._post_with_retries(platform_name, poster, message, image, album)
+        result["platform"] = platform_name
+        if poster.channel.name is not None:
+            result["channel"] = poster.channel.name
+        
+        # Partly posted albums are recorded too: posting them again would duplicate the part already sent
+        if post_key and (result["success"] or result.get("partial")):
+            self.post_index.record(post_key, platform_name, result.get("post_id") or result.get("tweet_id"))
+        result["elapsed"] = time.monotonic() - started_at
+        self.metrics.observe_post(platform_name, result, result["elapsed"])
+        return result
     
-    async def validate_channel_access(self) -> bool:
-        """Validate that the bot can access the specified channel"""
-        try:
-            import aiohttp
-            
-            headers = {
-                "Authorization": f"Bot {self.token}",
-                "Content-Type": "application/json"
-            }
+    async def _post_with_retries(self, platform_name: str, poster: BasePoster, message: str, image: SharedImage = None,
+                                 album: List[str] = None) -> Dict[str, bool]:
+        """Post to a single platform, retrying rate-limited posts up to MAX_RETRIES times
+        
+        A platform that asks for a wait longer than RETRY_MAX_DELAY (e.g. the X window resets in
+        15 minutes) is not waited for: the rate-limited result is returned straight away, so it
+        doesn't hold up the other platforms, and the outbox posts it on a later drain.
+        """
+        upload_bytes = len(message.encode('utf-8')) + (image.size if image else 0)
+        if album:
+            # Album paths are the platform's image variants, so this counts the bytes actually uploaded
+            upload_bytes += sum(os.path.getsize(image_path) for image_path in album)
+        attempt = 0
+        while True:
+            blocked_for = self.scheduler.blocked_for(platform_name)
+            if blocked_for > Config.RETRY_MAX_DELAY:
+                logger.warning(f"{platform_name} is rate limited for another {blocked_for:.0f}s, not waiting that long")
+                result = {
+                    "success": False,
+                    "platform": platform_name,
+                    "error": f"Rate limited for another {blocked_for:.0f}s",
+                    "rate_limited": True,
+                    "retry_after": blocked_for
+                }
+                break
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.base_url}/channels/{self.channel_id}",
-                    headers=headers
-                ) as response:
-                    if response.status == 200:
-                        channel_data = await response.json()
-                        logger.info(f"Discord channel validation successful: #{channel_data.get('name', 'Unknown')}")
-                        return True
-                    elif response.status == 404:
-                        logger.error(f"Discord channel not found (ID: {self.channel_id}). Please check:")
-                        logger.error("1. The channel ID is correct")
-                        logger.error("2. The bot has access to the channel")
-                        logger.error("3. The bot has the necessary permissions")
-                        return False
+            request_started_at = None
+            try:
+                self.metrics.observe_rate_limit_wait(platform_name, await self.scheduler.acquire(platform_name))
+                async with self._platform_limit(poster.platform):
+                    request_started_at = time.monotonic()
+                    if album:
+                        result = await poster.post_album(message, album)
                     else:
-                        error_text = await response.text()
-                        logger.error(f"Discord channel validation failed (HTTP {response.status}): {error_text}")
-                        return False
-        except Exception as e:
-            logger.error(f"Error validating Discord channel access: {str(e)}")
-            return False
-    
-    async def post_message(self, message: str, image_path: str = None) -> Dict[str, bool]:
-        """Post message to Discord channel with optional image"""
-        try:
-            # First validate channel access
-            if not await self.validate_channel_access():
-                return {"success": False, "platform": "Discord", "error": "Channel validation failed. Please check your Discord configuration."}
-            
-            import aiohttp
-            import base64
+                        result = await poster.post_message(message, image=image)
+            except Exception as e:
+                logger.error(f"Error posting to {platform_name}: {str(e)}")
+                result = {
+                    "success": False,
+                    "platform": platform_name,
+                    "error": str(e)
+                }
             
-            headers = {
-                "Authorization": f"Bot {self.token}",
-                "Content-Type": "application/json"
-            }
+            if request_started_at is not None:
+                self.metrics.observe_request(
+                    platform_name, time.monotonic() - request_started_at, upload_bytes, bool(result.get("rate_limited"))
+                )
             
-            # Prepare the payload
-            payload = {
-                "content": message
-            }
+            retry_after = self.scheduler.update_from_result(platform_name, result)
+            if result["success"] or not result.get("rate_limited") or attempt >= Config.MAX_RETRIES:
+                break
+            if retry_after is not None and retry_after > Config.RETRY_MAX_DELAY:
+                logger.warning(f"{platform_name} asked to retry in {retry_after:.0f}s, not waiting that long")
+                break
             
-            # If there's an image, we need to use multipart form data
+            delay = backoff_delay(attempt, retry_after)
+            attempt += 1
+            logger.warning(f"Retrying {platform_name} in {delay:.1f}s (attempt {attempt} of {Config.MAX_RETRIES})")
+            await asyncio.sleep(delay)
+            self.metrics.observe_rate_limit_wait(platform_name, delay)
+        
+        result["attempts"] = attempt + 1
+        return result
+    
+    async def post_to_all_platforms(self, message: str, image_path: str = None, concurrent: bool = None,
+                                    platforms: List[str] = None, all_channels: bool = False,
+                                    export_metrics: bool = True) -> List[Dict[str, bool]]:
+        """Post message and optional image to all configured platforms
+        
+        With concurrent dispatch (the default, see CONCURRENT_POSTING) every platform is posted to
+        in parallel, so a round takes about as long as the slowest platform. Otherwise platforms
+        are posted to one after another. Results are returned in platform order either way.
+        Pass `platforms` to post to a subset of the configured channels by key ("Telegram" is the
+        default Telegram channel, "Telegram:moonhome" another one). With `all_channels`, a
+        platform name also selects every other channel of that platform, so one entry can
+        produce several results. Metrics are written to METRICS_FILE after the round unless
+        `export_metrics` is off (e.g. an outbox drain exports once at the end).
+        """
+        if concurrent is None:
+            concurrent = Config.CONCURRENT_POSTING
+        
+        targets = self._select_targets(platforms, all_channels)
+        
+        # The image is mapped once and the same buffer is uploaded to every platform
+        # that can take it as is; platforms with tighter limits get a cached, resized variant
+        images: Dict[str, SharedImage] = {}
+        platform_images: Dict[str, SharedImage] = {}
+        image_digest = None
+        try:
             if image_path:
-                # Validate image file exists and is readable
-                import os
-                if not os.path.exists(image_path):
-                    raise Exception(f"Image file not found: {image_path}")
-                
-                if not os.path.isfile(image_path):
-                    raise Exception(f"Path is not a file: {image_path}")
-                
-                # Check file size (Discord has a 8MB limit for most servers)
-                file_size = os.path.getsize(image_path)
-                max_size = 8 * 1024 * 1024  # 8MB
-                if file_size > max_size:
-                    raise Exception(f"Image file too large: {file_size} bytes (max: {max_size} bytes)")
-                
-                # For images, we'll use a different approach with files
-                data = aiohttp.FormData()
-                data.add_field('content', message)
-                
-                # Read the file content and add it to form data
                 try:
-                    with open(image_path, 'rb') as f:
-                        file_content = f.read()
-                    
-                    # Determine content type based on file extension
-                    import mimetypes
-                    content_type, _ = mimetypes.guess_type(image_path)
-                    if not content_type:
-                        content_type = 'image/jpeg'  # Default fallback
-                    
-                    # Get filename from path
-                    filename = os.path.basename(image_path)
-                    data.add_field('file', file_content, filename=filename, content_type=content_type)
+                    images[image_path] = SharedImage(image_path)
+                    image_digest = images[image_path].sha256()
                     
+                    loop = asyncio.get_running_loop()
+                    for platform_name, poster in targets.items():
+                        variant_path = await loop.run_in_executor(
+                            self._executor, get_image_variant, image_path, poster.platform, image_digest
+                        )
+                        if variant_path not in images:
+                            images[variant_path] = SharedImage(variant_path)
+                        platform_images[platform_name] = images[variant_path]
                 except Exception as e:
-                    logger.error(f"Error reading image file {image_path}: {str(e)}")
-                    raise Exception(f"Failed to read image file: {str(e)}")
-                
-                headers = {"Authorization": f"Bot {self.token}"}
-                
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        f"{self.base_url}/channels/{self.channel_id}/messages",
-                        headers=headers,
-                        data=data
-                    ) as response:
-                        if response.status == 200:
-                            logger.info(f"Successfully posted image + message to Discord: {message[:50]}...")
-                            return {"success": True, "platform": "Discord"}
-                        else:
-                            error_text = await response.text()
-                            raise Exception(f"HTTP {response.status}: {error_text}")
-            else:
-                # Text only message
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        f"{self.base_url}/channels/{self.channel_id}/messages",
-                        headers=headers,
-                        json=payload
-                    ) as response:
-                        if response.status == 200:
-                            logger.info(f"Successfully posted to Discord: {message[:50]}...")
-                            return {"success": True, "platform": "Discord"}
-                        else:
-                            error_text = await response.text()
-                            raise Exception(f"HTTP {response.status}: {error_text}")
+                    logger.error(f"Error preparing image {image_path}: {str(e)}")
+                    return [
+                        {"success": False, "platform": platform_name, "error": f"Failed to read image file: {str(e)}"}
+                        for platform_name in targets
+                    ]
             
-        except Exception as e:
-            logger.error(f"Failed to post to Discord: {str(e)}")
-            return {"success": False, "platform": "Discord", "error": str(e)}
-
-
-class FacebookPoster:
-    """Handles posting to Facebook groups"""
-    
-    def __init__(self):
-        self.graph = facebook.GraphAPI(access_token=Config.FACEBOOK_ACCESS_TOKEN, version="3.1")
-        self.group_id = Config.FACEBOOK_GROUP_ID
-    
-    def post_message(self, message: str, image_path: str = None) -> Dict[str, bool]:
-        """Post message to Facebook group with optional image"""
-        try:
-            if image_path:
-                # Post with image
-                with open(image_path, 'rb') as image_file:
-                    response = self.graph.put_object(
-                        parent_object=self.group_id,
-                        connection_name="photos",
-                        message=message,
-                        source=image_file
-                    )
-                logger.info(f"Successfully posted image + message to Facebook: {message[:50]}...")
-            else:
-                # Post text only
-                response = self.graph.put_object(
-                    parent_object=self.group_id,
-                    connection_name="feed",
-                    message=message
-                )
-                logger.info(f"Successfully posted to Facebook: {message[:50]}...")
+            if concurrent:
+                return list(await asyncio.gather(*[
+                    self._post_to_platform(platform_name, poster, message, platform_images.get(platform_name), image_digest)
+                    for platform_name, poster in targets.items()
+                ]))
             
-            return {"success": True, "platform": "Facebook", "post_id": response.get('id')}
-        except Exception as e:
-            logger.error(f"Failed to post to Facebook: {str(e)}")
-            return {"success": False, "platform": "Facebook", "error": str(e)}
-
-
-class XPoster:
-    """Handles posting to X (Twitter)"""
-    
-    def __init__(self):
-        self.client = tweepy.Client(
-            consumer_key=Config.X_API_KEY,
-            consumer_secret=Config.X_API_SECRET,
-            access_token=Config.X_ACCESS_TOKEN,
-            access_token_secret=Config.X_ACCESS_TOKEN_SECRET
-        )
+            results = []
+            for platform_name, poster in targets.items():
+                results.append(await self._post_to_platform(
+                    platform_name, poster, message, platform_images.get(platform_name), image_digest
+                ))
+            
+            return results
+        finally:
+            for image in images.values():
+                image.close()
+            if export_metrics:
+                self.metrics.export()
     
-    def post_message(self, message: str, image_path: str = None) -> Dict[str, bool]:
-        """Post message to X (Twitter) with optional image"""
+    async def post_album_to_all_platforms(self, message: str, image_paths: List[str], platforms: List[str] = None,
+                                          all_channels: bool = False) -> List[Dict[str, bool]]:
+        """Post message with several images to all configured platforms
+        
+        Platforms with albums (a post_album method, e.g. Telegram) get every image (resized where
+        the platform needs it) in as few requests as possible; the others get the message with
+        the first image. `platforms` and
+        `all_channels` select channels like in post_to_all_platforms. Results are returned in
+        platform order.
+        """
+        if not image_paths:
+            return await self.post_to_all_platforms(message, platforms=platforms, all_channels=all_channels)
+        if len(image_paths) == 1:
+            return await self.post_to_all_platforms(message, image_paths[0], platforms=platforms, all_channels=all_channels)
+        
+        targets = self._select_targets(platforms, all_channels)
+        album_targets = [platform_name for platform_name, poster in targets.items() if hasattr(poster, "post_album")]
+        other_targets = [platform_name for platform_name in targets if platform_name not in album_targets]
+        
         try:
-            # Ensure message length is within Twitter's limit
-            if len(message) > 280:
-                message = message[:277] + "..."
-            
-            # Note: X/Twitter image posting requires additional setup with media upload
-            # For now, we'll post text only and log a note about images
-            if image_path:
-                logger.warning("Image posting to X/Twitter requires media upload setup - posting text only")
-            
-            response = self.client.create_tweet(text=message)
-            logger.info(f"Successfully posted to X: {message[:50]}...")
-            return {"success": True, "platform": "X", "tweet_id": response.data['id']}
+            loop = asyncio.get_running_loop()
+            digests = await asyncio.gather(*[
+                loop.run_in_executor(self._executor, file_sha256, image_path) for image_path in image_paths
+            ])
         except Exception as e:
-            logger.error(f"Failed to post to X: {str(e)}")
-            return {"success": False, "platform": "X", "error": str(e)}
-
-
-class SocialMediaPoster:
-    """Main class that coordinates posting to all platforms"""
-    
-    def __init__(self):
-        self.platforms = {
-            "Telegram": TelegramPoster(),
-            "Discord": DiscordPoster(),
-            # "Facebook": FacebookPoster(),
-            "X": XPoster()
-        }
+            logger.error(f"Error reading album images: {str(e)}")
+            return [
+                {"success": False, "platform": platform_name, "error": f"Failed to read image file: {str(e)}"}
+                for platform_name in targets
+            ]
+        album_digest = hashlib.sha256(",".join(digests).encode('utf-8')).hexdigest()
         
-        # Validate configuration
-        missing_configs = Config.validate_config()
-        if missing_configs:
-            logger.warning(f"Missing configuration for: {', '.join(missing_configs)}")
-            # Remove platforms with missing config
-            for platform in missing_configs:
-                if platform in self.platforms:
-                    del self.platforms[platform]
-    
-    async def post_to_all_platforms(self, message: str, image_path: str = None) -> List[Dict[str, bool]]:
-        """Post message and optional image to all configured platforms"""
-        results = []
+        # Like single images, every album image is resized to a cached variant where the platform needs it
+        albums: Dict[str, List[str]] = {}
+        try:
+            for platform in {targets[platform_name].platform for platform_name in album_targets}:
+                albums[platform] = list(await asyncio.gather(*[
+                    loop.run_in_executor(self._executor, get_image_variant, image_path, platform, digest)
+                    for image_path, digest in zip(image_paths, digests)
+                ]))
+        except Exception as e:
+            logger.error(f"Error preparing album images: {str(e)}")
+            return [
+                {"success": False, "platform": platform_name, "error": f"Failed to read image file: {str(e)}"}
+                for platform_name in targets
+            ]
         
-        for platform_name, poster in self.platforms.items():
-            try:
-                if platform_name in ["Telegram", "Discord"]:
-                    # Async platforms
-                    result = await poster.post_message(message, image_path)
-                else:
-                    # Sync platforms
-                    result = poster.post_message(message, image_path)
-                
-                results.append(result)
-                
-                # Add delay between posts to avoid rate limiting
-                if platform_name != list(self.platforms.keys())[-1]:  # Not the last platform
-                    time.sleep(Config.POST_DELAY)
-                    
-            except Exception as e:
-                logger.error(f"Error posting to {platform_name}: {str(e)}")
-                results.append({
-                    "success": False,
-                    "platform": platform_name,
-                    "error": str(e)
-                })
+        try:
+            posts = [
+                self._post_to_platform(
+                    platform_name, targets[platform_name], message, image_digest=album_digest,
+                    album=albums[targets[platform_name].platform]
+                )
+                for platform_name in album_targets
+            ]
+            if other_targets:
+                posts.append(self.post_to_all_platforms(
+                    message, image_paths[0], platforms=other_targets, export_metrics=False
+                ))
+            posted = await asyncio.gather(*posts)
+        finally:
+            self.metrics.export()
         
-        return results
+        results = {result["platform"]: result for result in posted[:len(album_targets)]}
+        if other_targets:
+            results.update((result["platform"], result) for result in posted[-1])
+        return [results[platform_name] for platform_name in targets]
     
-    def post_to_specific_platform(self, platform_name: str, message: str, image_path: str = None) -> Dict[str, bool]:
-        """Post message and optional image to a specific platform"""
+    async def post_to_specific_platform(self, platform_name: str, message: str, image_path: str = None) -> Dict[str, bool]:
+        """Post message and optional image to one channel (e.g. "X" or "Telegram:moonhome")"""
         if platform_name not in self.platforms:
             return {"success": False, "platform": platform_name, "error": "Platform not configured"}
         
-        try:
-            poster = self.platforms[platform_name]
-            if platform_name in ["Telegram", "Discord"]:
-                # For async platforms, we'll need to handle this differently in the main script
-                return {"success": False, "platform": platform_name, "error": "Use async method for this platform"}
-            else:
-                return poster.post_message(message, image_path)
-        except Exception as e:
-            logger.error(f"Error posting to {platform_name}: {str(e)}")
-            return {"success": False, "platform": platform_name, "error": str(e)}
+        results = await self.post_to_all_platforms(message, image_path, platforms=[platform_name])
+        return results[0]
+
+
+def __getattr__(name: str):
+    """Lazily expose the poster classes that used to be defined in this module"""
+    poster_platforms = {
+        "TelegramPoster": "Telegram",
+        "DiscordPoster": "Discord",
+        "FacebookPoster": "Facebook",
+        "XPoster": "X"
+    }
+    if name in poster_platforms:
+        return load_poster_class(poster_platforms[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def print_metrics_summary(poster: SocialMediaPoster):
+    """Print where posting time went, slowest platform first"""
+    summary = poster.metrics.summary()
+    if not summary:
+        return
+    
+    print("\nPosting Metrics:")
+    print("-" * 30)
+    for row in summary:
+        print(
+            f"⏱️  {row['platform']}: {row['total_seconds']:.2f}s total, {row['avg_seconds']:.2f}s avg, "
+            f"{row['success_ratio']:.0%} success, {row['retries']} retries, "
+            f"{row['rate_limit_wait']:.1f}s rate limit wait, {row['bytes_uploaded'] / 1024:.0f} KB"
+        )
 
 
 def read_message_from_file(filename: str = "smm_message.md") -> str:
@@ -362,49 +394,21 @@ def read_message_from_file(filename: str = "smm_message.md") -> str:
 
 async def post_real_content():
     """Post real content from message file and NASA APOD"""
-    poster = SocialMediaPoster()
-    
-    # Try to read message from file
-    message = read_message_from_file()
-    
-    if message:
-        print(f"📝 Posting message from file: {message[:100]}{'...' if len(message) > 100 else ''}")
-        print("=" * 50)
+    async with SocialMediaPoster() as poster:
+        # Try to read message from file
+        message = read_message_from_file()
         
-        # Post message to all platforms
-        results = await poster.post_to_all_platforms(message)
+        if message:
+            print(f"📝 Posting message from file: {message[:100]}{'...' if len(message) > 100 else ''}")
+            print("=" * 50)
         
-        # Display results
-        print("\nMessage Posting Results:")
-        print("-" * 30)
-        for result in results:
-            status = "✅ SUCCESS" if result["success"] else "❌ FAILED"
-            platform = result["platform"]
-            if result["success"]:
-                print(f"{status} - {platform}")
-            else:
-                error = result.get("error", "Unknown error")
-                print(f"{status} - {platform}: {error}")
-    
-    # Post NASA APOD content
-    try:
-        from nasa_apod import NASAAPOD
-        nasa = NASAAPOD(Config.NASA_API_KEY)
-        apod_message, image_path = nasa.get_apod_content()
+            # Post message to all platforms
+            results = await poster.post_to_all_platforms(message)
         
-        if apod_message:
-            print(f"\n🔭 Posting NASA APOD: {apod_message[:100]}{'...' if len(apod_message) > 100 else ''}")
-            if image_path:
-                print(f"🖼️  With image: {image_path}")
-            print("=" * 50)
-            
-            # Post APOD to all platforms
-            apod_results = await poster.post_to_all_platforms(apod_message, image_path)
-            
-            # Display APOD results
-            print("\nNASA APOD Posting Results:")
+            # Display results
+            print("\nMessage Posting Results:")
             print("-" * 30)
-            for result in apod_results:
+            for result in results:
                 status = "✅ SUCCESS" if result["success"] else "❌ FAILED"
                 platform = result["platform"]
                 if result["success"]:
@@ -412,52 +416,88 @@ async def post_real_content():
                 else:
                     error = result.get("error", "Unknown error")
                     print(f"{status} - {platform}: {error}")
-    except ImportError:
-        logger.warning("NASA APOD module not available")
-    except Exception as e:
-        logger.error(f"Error posting NASA APOD: {str(e)}")
+        
+        # Post NASA APOD content
+        try:
+            from nasa_apod import NASAAPOD
+            nasa = NASAAPOD(Config.NASA_API_KEY)
+            apod_message, image_path = nasa.get_apod_content()
+        
+            if apod_message:
+                print(f"\n🔭 Posting NASA APOD: {apod_message[:100]}{'...' if len(apod_message) > 100 else ''}")
+                if image_path:
+                    print(f"🖼️  With image: {image_path}")
+                print("=" * 50)
+        
+                # Post APOD to all platforms
+                apod_results = await poster.post_to_all_platforms(apod_message, image_path)
+        
+                # Display APOD results
+                print("\nNASA APOD Posting Results:")
+                print("-" * 30)
+                for result in apod_results:
+                    status = "✅ SUCCESS" if result["success"] else "❌ FAILED"
+                    platform = result["platform"]
+                    if result["success"]:
+                        print(f"{status} - {platform}")
+                    else:
+                        error = result.get("error", "Unknown error")
+                        print(f"{status} - {platform}: {error}")
+        except ImportError:
+            logger.warning("NASA APOD module not available")
+        except Exception as e:
+            logger.error(f"Error posting NASA APOD: {str(e)}")
+        
+        print_metrics_summary(poster)
 
 
 async def main(message: str = None):
     """Main function to demonstrate usage"""
-    poster = SocialMediaPoster()
-    
-    # Use provided message or create a meaningful default
-    if not message:
-        from datetime import datetime
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        message = f"""🚀 Social Media Bot Update - {timestamp}
+    async with SocialMediaPoster() as poster:
+        # Use provided message or create a meaningful default
+        if not message:
+            from datetime import datetime
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            message = f"""🚀 Social Media Bot Update - {timestamp}
 
 📱 Automated posting to multiple platforms
 🔧 Powered by Python and social media APIs
 📊 Real-time content distribution
 
 #SocialMedia #Automation #Python #Bot #Tech"""
-    
-    print(f"Posting message: {message[:100]}{'...' if len(message) > 100 else ''}")
-    print("=" * 50)
-    
-    # Post to all platforms
-    results = await poster.post_to_all_platforms(message)
-    
-    # Display results
-    print("\nPosting Results:")
-    print("-" * 30)
-    for result in results:
-        status = "✅ SUCCESS" if result["success"] else "❌ FAILED"
-        platform = result["platform"]
-        if result["success"]:
-            print(f"{status} - {platform}")
-        else:
-            error = result.get("error", "Unknown error")
-            print(f"{status} - {platform}: {error}")
+        
+        print(f"Posting message: {message[:100]}{'...' if len(message) > 100 else ''}")
+        print("=" * 50)
+        
+        # Post to all platforms
+        results = await poster.post_to_all_platforms(message)
+        
+        # Display results
+        print("\nPosting Results:")
+        print("-" * 30)
+        for result in results:
+            status = "✅ SUCCESS" if result["success"] else "❌ FAILED"
+            platform = result["platform"]
+            if result["success"]:
+                print(f"{status} - {platform}")
+            else:
+                error = result.get("error", "Unknown error")
+                print(f"{status} - {platform}: {error}")
+        
+        print_metrics_summary(poster)
 
 
 if __name__ == "__main__":
     import sys
     
-    # Check if configuration is valid
-    missing_configs = Config.validate_config()
+    # Check if the enabled platforms are configured (the settings they need come from the poster registry)
+    missing_configs = []
+    for platform_name in Config.ENABLED_PLATFORMS:
+        try:
+            if missing_settings(platform_name):
+                missing_configs.append(platform_name)
+        except KeyError:
+            missing_configs.append(platform_name)
     if missing_configs:
         print(f"⚠️  Warning: Missing configuration for: {', '.join(missing_configs)}")
         print("Please check your .env file and ensure all required API keys are set.")
@@ -1,8 +1,41 @@
 """Utilities for using in the api"""
 
+import hashlib
+import os
+import sqlite3
+
 
 def get_api_key() -> str:
     """Get the API key from file"""
     with open('gg_api_key', 'r') as gg_api_key_file:
         api_key = gg_api_key_file.read()
     return api_key
+
+
+def file_digest(path: str, chunk_size: int = 1024 * 1024):
+    """Get a SHA-256 hash object fed with a file's contents, e.g. to keep hashing data appended to it"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file_to_hash:
+        for chunk in iter(lambda: file_to_hash.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Get the SHA-256 hex digest of a file, reading it in chunks"""
+    return file_digest(path, chunk_size).hexdigest()
+
+
+def open_sqlite(path: str, schema: str, wal: bool = False, check_same_thread: bool = True) -> sqlite3.Connection:
+    """Open a SQLite store, creating its folder and tables if needed; rows are returned as sqlite3.Row"""
+    db_dir = os.path.dirname(path)
+    if db_dir:
+        os.makedirs(db_dir, exist_ok=True)
+
+    conn = sqlite3.connect(path, check_same_thread=check_same_thread)
+    conn.row_factory = sqlite3.Row
+    if wal:
+        conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(schema)
+    conn.commit()
+    return conn